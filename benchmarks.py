@@ -0,0 +1,156 @@
+"""
+Benchmarks for the headless parts of the application.
+
+Run with `python benchmarks.py`; nothing here opens a window.
+"""
+import os
+import random
+import subprocess
+import sys
+import time
+
+import tkinter as tk
+
+import numpy as np
+import pandas as pd
+
+from src import BatchedTreeview, ExpenseStore, PomodoroEngine, TaskStore, TickScheduler, VirtualClock
+
+
+# Imports src in a fresh interpreter and reports the time taken and which heavy modules got loaded
+STARTUP_PROBE = """
+import sys, time
+started = time.perf_counter()
+import src
+elapsed = time.perf_counter() - started
+print(elapsed, *[name for name in ('pandas', 'numpy', 'matplotlib') if name in sys.modules])
+"""
+
+
+def bench_startup(runs=5):
+    """
+    Time a cold `import src` in fresh interpreters, the part of startup before the menu draws.
+
+    - Reports the best of `runs` and fails if pandas, numpy or matplotlib were imported eagerly.
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", STARTUP_PROBE], cwd=directory,
+                                capture_output=True, text=True, check=True).stdout.split()
+        timings.append(float(output[0]))
+        assert not output[1:], f"imported at startup: {', '.join(output[1:])}"
+    print(f"startup: import src best of {runs} in {min(timings) * 1000:.0f}ms")
+    return min(timings)
+
+
+def bench_pomodoro_engines(count=5000, work=25 * 60, short_break=5 * 60, long_break=15 * 60, step=1.0):
+    """
+    Step `count` engines through one full cycle each in virtual time.
+
+    - All engines share one TickScheduler, started at staggered offsets so deadlines interleave.
+    - Reports the wall time spent and the number of session deadlines the scheduler fired.
+    """
+    clock = VirtualClock()
+    scheduler = TickScheduler(clock)
+    rng = random.Random(0)
+    engines = [PomodoroEngine(f"timer-{i}", scheduler, work, short_break, long_break) for i in range(count)]
+    for engine in engines:
+        engine.start()
+        engine.deadline += rng.uniform(0, 60)
+        scheduler.schedule(engine, engine.deadline)
+
+    fired = 0
+    started = time.perf_counter()
+    end = 2 * work + short_break + long_break + 60
+    while clock.now <= end:
+        clock.advance(step)
+        fired += scheduler.run_due()
+    elapsed = time.perf_counter() - started
+
+    assert all(engine.pomodoro_count == 1 for engine in engines)
+    print(f"pomodoro: {count} engines, {fired} deadlines, {int(end / step)} ticks in {elapsed:.3f}s")
+    return elapsed
+
+
+def bench_table(count=100_000):
+    """
+    Rows per second for the table layer as the apps use it.
+
+    - Expenses: `ExpenseStore.display_rows` over a ledger of `count` rows, cold and then with
+      the date and amount texts cached.
+    - Tasks: `TaskStore.display_rows` over `count` tasks.
+    - Insertion: filling a BatchedTreeview with the task rows until its last batch lands;
+      skipped without a display.
+    """
+    rng = np.random.default_rng(0)
+    store = ExpenseStore()
+    store.extend(pd.DataFrame({
+        'Date': pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 2000, count), unit='D'),
+        'Amount': rng.integers(1, 100_000, count) / 100,
+        'Category': rng.choice(['Food', 'Transportation', 'Utilities'], count),
+        'Description': [f"item {i}" for i in range(count)],
+    }))
+    row_ids = store.rows()
+    for state in ('cold', 'cached'):
+        started = time.perf_counter()
+        store.display_rows(row_ids)
+        elapsed = time.perf_counter() - started
+        print(f"table: formatted {count} expenses ({state}) at {count / elapsed:,.0f} rows/s")
+
+    tasks = TaskStore([(i, f"task {i}", i % 3 == 0, i % 2 == 0, None) for i in range(1, count + 1)])
+    started = time.perf_counter()
+    rows = tasks.display_rows()
+    elapsed = time.perf_counter() - started
+    print(f"table: formatted {count} tasks at {count / elapsed:,.0f} rows/s")
+
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        print("table: no display, skipping Treeview insertion")
+        return
+    table = BatchedTreeview(root, ("ID", "Task", "Important", "Done"))
+    table.pack()
+    started = time.perf_counter()
+    table.set_rows(rows, [row[0] for row in rows], on_done=root.quit)
+    root.mainloop()
+    elapsed = time.perf_counter() - started
+    root.destroy()
+    print(f"table: inserted {count} rows at {count / elapsed:,.0f} rows/s")
+
+
+def bench_search(count=1_000_000, runs=5):
+    """
+    Best-of-`runs` latency of description searches over a ledger of `count` expenses.
+
+    - Descriptions are two words from a small vocabulary, so a one-letter prefix such as 'a'
+      matches about a fifth of the ledger.
+    - The first search of each query builds the prefix cache; the best run shows a search
+      repeated while the user types.
+    """
+    words = ["coffee", "taxi", "rent", "groceries", "lunch", "dinner", "bus", "train", "movie", "gym",
+             "book", "apple", "amazon", "uber", "pizza", "salad", "gas", "water", "phone", "internet"]
+    rng = random.Random(7)
+    store = ExpenseStore()
+    store.extend(pd.DataFrame({
+        'Date': pd.Timestamp('2020-01-01') + pd.to_timedelta(np.random.default_rng(7).integers(0, 2000, count), unit='D'),
+        'Amount': np.random.default_rng(8).integers(1, 100_000, count) / 100,
+        'Category': np.random.default_rng(9).choice(['Food', 'Transportation', 'Utilities'], count),
+        'Description': [' '.join(rng.sample(words, 2)) for _ in range(count)],
+    }))
+    store.query(text='x')
+    for text, filters in (('coffee', {}), ('coffee taxi', {}), ('a', {}), ('coffee', {'category': 'Food'}),
+                          ('pizza', {'min_amount': 10, 'max_amount': 12})):
+        best = float('inf')
+        for _ in range(runs):
+            started = time.perf_counter()
+            rows = store.query(text=text, **filters)
+            best = min(best, time.perf_counter() - started)
+        print(f"search: {text!r} {filters} -> {len(rows)} rows in {best * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    bench_startup()
+    bench_pomodoro_engines()
+    bench_table()
+    bench_search()
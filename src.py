@@ -1,11 +1,57 @@
-import pandas as pd
 import tkinter as tk
 from tkinter import ttk, messagebox
-import matplotlib.pyplot as plt
 import os
+import bisect
+import itertools
+import importlib
 import ttkbootstrap as tb
 import time
+import math
 import json
+import re
+import datetime
+import shutil
+import queue
+import threading
+import heapq
+import sqlite3
+import contextlib
+import collections
+from concurrent.futures import ThreadPoolExecutor
+
+
+class LazyModule:
+    """
+    Stand-in for a heavy module that is only imported on first use.
+
+    - The first attribute access imports the module; its namespace is then copied onto the
+      stand-in, so later lookups cost the same as on the module itself.
+    - `_lazy_load` imports it explicitly, as the background warm-up does.
+    """
+    def __init__(self, name):
+        self._lazy_name = name
+        self._lazy_module = None
+
+    def _lazy_load(self):
+        if self._lazy_module is None:
+            module = importlib.import_module(self._lazy_name)
+            self.__dict__.update(module.__dict__)
+            self._lazy_module = module
+        return self._lazy_module
+
+    def __getattr__(self, attribute):
+        return getattr(self._lazy_load(), attribute)
+
+    def __repr__(self):
+        return f"<lazy module {self._lazy_name!r}>"
+
+
+# The main menu needs none of these; each is imported when a module first uses it
+pd = LazyModule("pandas")
+np = LazyModule("numpy")
+mpl_style = LazyModule("matplotlib.style")
+mpl_figure = LazyModule("matplotlib.figure")
+mpl_backend = LazyModule("matplotlib.backends.backend_tkagg")
 
 
 class mainWindow:
@@ -15,6 +61,7 @@ class mainWindow:
         self.root = tb.Window(themename='journal')
         self.root.style.theme_use('journal')
         self.root.title(title)
+        self.window_title = title
         self.current_frame = None
         self.screenWidth = self.root.winfo_screenwidth()
         self.screenHeight = self.root.winfo_screenheight()
@@ -38,7 +85,6 @@ class mainWindow:
         
         if hasattr(self, 'current_frame') and self.current_frame is not None:
             for widget in self.current_frame.winfo_children():
-                print(widget)
                 widget.destroy()
                 
             self.current_frame.destroy()
@@ -46,7 +92,6 @@ class mainWindow:
     
         #Remove remaining widgets 
         for widget in self.root.winfo_children():
-            print(widget)
             widget.destroy()
         
     # Start the main application loop
@@ -56,19 +101,49 @@ class mainWindow:
 
 class mainApp(mainWindow):
 
-    def __init__(self, title):
+    # Heavy modules preloaded by `warm_up` once the menu is on screen
+    WARM_UP_MODULES = (pd, np, mpl_style, mpl_figure, mpl_backend)
+
+    def __init__(self, title, warm_up=True):
         super().__init__(title)
+        self.database = Database()
+        self.io = IOExecutor(self.root)
+        # Callables run before the application exits, keyed by module so revisits replace them
+        self.exit_hooks = {}
+        self.screens = ScreenManager(self.root)
+        self.modules = {}
+        # Closing the window exits through the same path as the Exit button
+        self.root.protocol("WM_DELETE_WINDOW", self.exit_app)
         self.menuGUI()
+        if warm_up:
+            self.root.after_idle(self.warm_up)
 
+    def warm_up(self):
+        """Import the modules deferred at startup on a background thread, so opening a module is instant."""
+        def preload():
+            for module in self.WARM_UP_MODULES:
+                try:
+                    module._lazy_load()
+                except Exception as e:
+                    print(f"Failed to preload {module!r}: {e}")
+
+        threading.Thread(target=preload, daemon=True).start()
+
+    # Show the main menu, building it the first time
     def menuGUI(self):
+        self.screens.show('menu', self._build_menu, pady=10, padx=10, fill='both', expand=True)
+
+    def on_show(self):
+        self.root.title(self.window_title)
+
+    def _build_menu(self):
         """
-        Set up and display the main menu.
+        Set up the main menu.
 
         - Adds navigation buttons to access different modules of the application.
         - Ensures buttons are styled and spaced consistently.
         """
         self.current_frame = ttk.Labelframe(self.root, text="Main Menu", padding=(100, 100))
-        self.current_frame.pack(pady=10, padx=10, fill='both', expand=True)
         
         titleLabel = ttk.Label(self.current_frame, text="Quaktask", bootstyle='primary',font=("Arial", 40, "bold"))
         titleLabel.pack(padx=10, pady=10)
@@ -85,41 +160,1649 @@ class mainApp(mainWindow):
             ttk.Button(self.current_frame, text='Pomodoro Timer', style='Custom.TButton',
                        command=self.open_PomodoroTimer).pack(ipadx=103, ipady=10, pady=20, fill=None, expand=True),
             ttk.Button(self.current_frame, text='Exit', style='Custom2.TButton',
-                       command=self.root.quit).pack(ipadx=100, ipady=10, pady=20, fill=None, expand=True)
+                       command=self.exit_app).pack(ipadx=100, ipady=10, pady=20, fill=None, expand=True)
         ]
+        return self
 
     
-    # Open the Expense Tracker in a new window
+    # Finish queued saves before leaving the main loop
+    def exit_app(self):
+        for hook in list(self.exit_hooks.values()):
+            try:
+                hook()
+            except Exception as e:
+                print(f"Exit hook failed: {e}")
+        self.io.flush()
+        self.root.quit()
+
+    # Show a module's screen, building the module the first time it is opened
+    def open_module(self, name, module_class, title, **pack_options):
+        def build():
+            self.modules[name] = module_class(title, self.root, self)
+            return self.modules[name]
+
+        self.screens.show(name, build, **pack_options)
+
+    # Open the Expense Tracker
     def open_expense_tracker(self):
-
-        self.clear_frame()
-        Expense = ExpenseTracker("Expense Tracker", self.root, self)
-        self.current_frame = Expense.current_frame
+        self.open_module('expenses', ExpenseTracker, "Expense Tracker", fill='both')
 
 
-    # Open the Expense Tracker in a new window
+    # Open the Flashcard Quizzer
     def open_flashcard(self):
-        
-        self.clear_frame()
-        Flashcard = FlashcardApp("Flashcard", self.root, self)
-        self.current_frame = Flashcard.current_frame
+        self.open_module('flashcards', FlashcardApp, "Flashcard", fill='both')
 
 
-    # Open the To-Do List in a new window
+    # Open the To-Do List
     def open_ToDoList(self):
-        
-        self.clear_frame()
-        ToDoList = ToDoApp("Flashcard", self.root, self)
-        self.current_frame = ToDoList.current_frame
+        self.open_module('todo', ToDoApp, "To-Do List", fill='both', expand=True)
 
 
-    # Open the Expense Tracker in a new window
+    # Open the Pomodoro Timer
     def open_PomodoroTimer(self):
-        
-        self.clear_frame()
-        PomodoroTimer = Pomodorotimer("Pomodoro Timer", self.root, self)
-        self.current_frame = PomodoroTimer.current_frame
-        
+        self.open_module('pomodoro', Pomodorotimer, "Pomodoro Timer", fill='both', expand=True)
+
+
+class ScreenManager:
+    """
+    Keeps every screen alive and switches between them.
+
+    - A screen is any object with a `current_frame`; it is built the first time it is shown.
+    - Switching only unpacks one frame and packs another, so widgets and in-memory state
+      (a loaded ledger, a running timer) survive trips through the menu.
+    - A screen's optional `on_show()` runs each time it is shown, to restore the window title
+      and shared style settings it relies on.
+    """
+    def __init__(self, root):
+
+        self.root = root
+        self.screens = {}
+        self.current = None
+
+    def show(self, name, build, **pack_options):
+        if name == self.current:
+            return self.screens[name][0]
+        if self.current is not None:
+            self.screens[self.current][0].current_frame.pack_forget()
+
+        if name not in self.screens:
+            self.screens[name] = (build(), pack_options)
+        screen, options = self.screens[name]
+        screen.current_frame.pack(**options)
+        self.current = name
+        if hasattr(screen, 'on_show'):
+            screen.on_show()
+        return screen
+
+
+class Database:
+    """
+    Local SQLite database shared by every module.
+
+    - Runs in WAL mode, so the background writers never block readers on the Tk thread.
+    - Hands out connections from a small pool; each connection caches its prepared statements,
+      so the fixed SQL used by the modules is compiled once per connection.
+    - `transaction` groups a batch of writes into one commit.
+    - Columns added to a table after its first release are listed in `ADDED_COLUMNS` and added
+      to older databases when they are opened.
+    - A module's setting is written with its first save and marks its old file as imported;
+      `SAVED_MARKERS` maps each such setting to its table, so databases saved before the
+      marker existed get one when they are opened.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS expenses (
+            id INTEGER PRIMARY KEY, day INTEGER NOT NULL, cents INTEGER NOT NULL,
+            category TEXT NOT NULL, description TEXT NOT NULL);
+        CREATE INDEX IF NOT EXISTS expenses_day ON expenses (day, id);
+        CREATE INDEX IF NOT EXISTS expenses_category ON expenses (category, day);
+        CREATE TABLE IF NOT EXISTS flashcards (question TEXT PRIMARY KEY, answer TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS decks (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, cards INTEGER NOT NULL DEFAULT 0);
+        CREATE TABLE IF NOT EXISTS deck_cards (
+            deck INTEGER NOT NULL, question TEXT NOT NULL, answer TEXT NOT NULL, PRIMARY KEY (deck, question));
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY, task TEXT NOT NULL,
+            important INTEGER NOT NULL DEFAULT 0, done INTEGER NOT NULL DEFAULT 0, done_on INTEGER);
+        CREATE INDEX IF NOT EXISTS tasks_status ON tasks (done, important);
+        CREATE TABLE IF NOT EXISTS pomodoro_sessions (
+            id INTEGER PRIMARY KEY, start TEXT NOT NULL, end TEXT NOT NULL, cycle INTEGER NOT NULL,
+            type TEXT NOT NULL, planned REAL NOT NULL, actual REAL NOT NULL);
+        CREATE INDEX IF NOT EXISTS pomodoro_sessions_start ON pomodoro_sessions (start, id);
+    """
+    ADDED_COLUMNS = {'tasks': {'done_on': 'INTEGER'}}
+    SAVED_MARKERS = {'expenses': 'expenses', 'tasks': 'tasks'}
+
+    def __init__(self, path="quaktask.db", pool_size=4):
+
+        self.path = path
+        self.pool_size = pool_size
+        self._idle = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+        with self.connection() as connection:
+            connection.executescript(self.SCHEMA)
+            for table, columns in self.ADDED_COLUMNS.items():
+                existing = {row[1] for row in connection.execute(f"PRAGMA table_info({table})")}
+                for column, declaration in columns.items():
+                    if column not in existing:
+                        connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+            for key, table in self.SAVED_MARKERS.items():
+                connection.execute(f"INSERT OR IGNORE INTO settings (key, value) SELECT ?, '{{}}' WHERE EXISTS (SELECT 1 FROM {table})",
+                                   (key,))
+
+    def _connect(self):
+        # Autocommit mode; batches are grouped explicitly by `transaction`
+        connection = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False,
+                                     cached_statements=256)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @contextlib.contextmanager
+    def connection(self):
+        """Borrow a pooled connection, opening one if the pool is not full yet."""
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = self._opened < self.pool_size
+                if can_open:
+                    self._opened += 1
+            connection = self._connect() if can_open else self._idle.get()
+        try:
+            yield connection
+        finally:
+            self._idle.put(connection)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Run a batch of writes on one connection and commit them together."""
+        with self.connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def query(self, sql, parameters=()):
+        with self.connection() as connection:
+            return connection.execute(sql, parameters).fetchall()
+
+    def get_setting(self, key, default=None):
+        rows = self.query("SELECT value FROM settings WHERE key = ?", (key,))
+        return json.loads(rows[0][0]) if rows else default
+
+    def set_setting(self, connection, key, value):
+        connection.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+
+
+class IOExecutor:
+    """
+    Thread pool for file and database work, so the Tk thread never waits on I/O.
+
+    - `submit` must be called on the Tk thread. Jobs run on worker threads, and their `on_done(result)`
+      or `on_error(exception)` callbacks are run back on the Tk thread by a `root.after` poll
+      that only runs while jobs are outstanding.
+    - Jobs sharing a `lane` run one at a time in submission order, so the saves and loads of
+      one module never overtake each other.
+    - A job submitted with a `merge` name replaces the last waiting job of its lane if that job
+      has the same name, so repeated saves queued behind a running one collapse into one write.
+    """
+    POLL_MS = 30
+
+    def __init__(self, root, workers=4):
+
+        self.root = root
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="io")
+        self._completions = queue.Queue()
+        self._condition = threading.Condition()
+        self._lanes = {}
+        self._outstanding = 0
+        self._poll_id = None
+
+    def submit(self, fn, *args, lane=None, merge=None, on_done=None, on_error=None):
+        job = (fn, args, merge, on_done, on_error)
+        with self._condition:
+            waiting = self._lanes.get(lane) if lane is not None else None
+            if waiting is not None and merge is not None and waiting and waiting[-1][2] == merge:
+                waiting[-1] = job
+                start = False
+            elif waiting is not None:
+                waiting.append(job)
+                self._outstanding += 1
+                start = False
+            else:
+                if lane is not None:
+                    self._lanes[lane] = collections.deque()
+                self._outstanding += 1
+                start = True
+        if start:
+            self._pool.submit(self._run, lane, job)
+        if self._poll_id is None:
+            self._poll_id = self.root.after(self.POLL_MS, self._poll)
+
+    def pending(self):
+        with self._condition:
+            return self._outstanding
+
+    def flush(self, timeout=None):
+        """Block until every submitted job has finished; their callbacks are not run."""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._outstanding == 0, timeout)
+
+    # Worker thread: run one job, then start the next waiting job of its lane
+    def _run(self, lane, job):
+        fn, args, _, on_done, on_error = job
+        try:
+            self._completions.put((on_done, fn(*args)))
+        except Exception as e:
+            self._completions.put((on_error or self._report, e))
+        finally:
+            next_job = None
+            with self._condition:
+                self._outstanding -= 1
+                if lane is not None:
+                    if self._lanes[lane]:
+                        next_job = self._lanes[lane].popleft()
+                    else:
+                        del self._lanes[lane]
+                self._condition.notify_all()
+            if next_job is not None:
+                self._pool.submit(self._run, lane, next_job)
+
+    # Tk thread: run the callbacks of finished jobs
+    def _poll(self):
+        while True:
+            try:
+                callback, value = self._completions.get_nowait()
+            except queue.Empty:
+                break
+            if callback is None:
+                continue
+            try:
+                callback(value)
+            except Exception as e:
+                print(f"I/O callback failed: {e}")
+
+        if self.pending() or not self._completions.empty():
+            self._poll_id = self.root.after(self.POLL_MS, self._poll)
+        else:
+            self._poll_id = None
+
+    def _report(self, error):
+        print(f"Background I/O failed: {error}")
+
+
+def format_days(days):
+    """Format epoch days as 'YYYY-MM-DD' strings in one vectorized pass."""
+    return np.datetime_as_string(np.asarray(days, dtype=np.int64).astype('datetime64[D]'), unit='D').tolist()
+
+
+def format_cents(cents):
+    """
+    Format whole cents as money strings such as '$12.50' or '-$0.05', in one vectorized pass.
+
+    - Works on the integer cents directly, so there is no float rounding to get wrong.
+    """
+    cents = np.asarray(cents, dtype=np.int64)
+    magnitude = np.abs(cents)
+    dollars = (magnitude // 100).astype(str)
+    remainder = np.char.zfill((magnitude % 100).astype(str), 2)
+    prefix = np.where(cents < 0, '-$', '$')
+    return np.char.add(np.char.add(np.char.add(prefix, dollars), '.'), remainder).tolist()
+
+
+class TableView:
+    """
+    Shared base of the Treeview tables: a frame holding a headed tree and its scrollbar.
+
+    - `_insert` passes prebuilt values straight to Tcl, skipping ttk's per-call option handling.
+    - `on_heading(column)`, when given, is called when a column heading is clicked.
+    """
+    def __init__(self, parent, columns, on_heading=None, **kwargs):
+
+        self.frame = ttk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, columns=columns, show="headings", **kwargs)
+        for column in columns:
+            if on_heading is None:
+                self.tree.heading(column, text=column)
+            else:
+                self.tree.heading(column, text=column, command=lambda column=column: on_heading(column))
+        self.scrollbar = ttk.Scrollbar(self.frame, orient='vertical')
+        self.tree.pack(side=tk.LEFT, expand=True, fill='both')
+        self.scrollbar.pack(side=tk.RIGHT, fill='y')
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def _insert(self, index, iid, values):
+        if iid is None:
+            self.tree.tk.call(self.tree._w, 'insert', '', index, '-values', values)
+        else:
+            self.tree.tk.call(self.tree._w, 'insert', '', index, '-id', iid, '-values', values)
+
+
+class BatchedTreeview(TableView):
+    """
+    Treeview filled in batches, so large tables never block the Tk thread for long.
+
+    - `set_rows` inserts the first batch at once and each further batch from an idle callback,
+      letting Tk handle input and redraws in between.
+    - Starting a new fill cancels the batches left over from the previous one.
+    - `append_rows`, `update_rows` and `delete_rows` change single rows by iid without a
+      refill; a fill still in progress is completed first so it cannot overwrite them.
+    - `show_rows` switches to another selection of rows in the same order, such as a different
+      filter of one list, by removing and inserting only the rows that differ.
+    """
+    BATCH_SIZE = 500
+
+    def __init__(self, parent, columns, batch_size=BATCH_SIZE, on_heading=None, **kwargs):
+        super().__init__(parent, columns, on_heading, **kwargs)
+        self.tree.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.configure(command=self.tree.yview)
+        self.batch_size = batch_size
+        self._pending = None
+        self._remaining = None
+
+    def set_rows(self, rows, iids=None, on_done=None):
+        """Replace the rows with `rows` (tuples of display values), optionally keyed by `iids`."""
+        self.cancel()
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+        self._insert_batch(rows, iids, 0, on_done)
+
+    def append_rows(self, rows, iids):
+        """Add rows at the end of the table."""
+        self.finish()
+        for iid, row in zip(iids, rows):
+            self._insert('end', iid, row)
+
+    def update_rows(self, rows, iids):
+        """Replace the values of existing rows, keyed by iid."""
+        self.finish()
+        for iid, row in zip(iids, rows):
+            self.tree.tk.call(self.tree._w, 'item', iid, '-values', row)
+
+    def delete_rows(self, iids):
+        """Remove rows by iid in a single Tk call."""
+        self.finish()
+        if iids:
+            self.tree.delete(*iids)
+
+    def show_rows(self, iids, row_values):
+        """
+        Show exactly the rows `iids`, keeping the current order; `row_values` maps a list of
+        iids to their values and is only called for rows entering the table.
+
+        - When more rows enter than fit in a batch, the table is refilled in batches instead.
+        """
+        self.finish()
+        current = self.tree.get_children()
+        present = set(current)
+        entering = [index for index, iid in enumerate(iids) if iid not in present]
+        if len(entering) > self.batch_size:
+            self.set_rows(row_values(iids), iids)
+            return
+
+        keep = set(iids)
+        leaving = [iid for iid in current if iid not in keep]
+        if leaving:
+            self.tree.delete(*leaving)
+        # Inserting in order puts each row after the rows that precede it in `iids`
+        values = row_values([iids[index] for index in entering])
+        for index, row in zip(entering, values):
+            self._insert(index, iids[index], row)
+
+    def finish(self):
+        """Insert whatever is left of a fill in progress right away."""
+        if self._pending is not None:
+            self.tree.after_cancel(self._pending)
+            rows, iids, start, on_done = self._remaining
+            self._insert_batch(rows, iids, start, on_done, len(rows))
+
+    def cancel(self):
+        if self._pending is not None:
+            self.tree.after_cancel(self._pending)
+            self._pending = None
+            self._remaining = None
+
+    def _insert_batch(self, rows, iids, start, on_done, batch_size=None):
+        self._pending = None
+        self._remaining = None
+        stop = min(len(rows), start + (batch_size or self.batch_size))
+        for index in range(start, stop):
+            self._insert('end', None if iids is None else iids[index], rows[index])
+
+        if stop < len(rows):
+            self._pending = self.tree.after_idle(self._insert_batch, rows, iids, stop, on_done)
+            self._remaining = (rows, iids, stop, on_done)
+        elif on_done is not None:
+            on_done()
+
+
+class VirtualTreeview(TableView):
+    """
+    Treeview that only materialises the rows currently in view.
+
+    - Holds the ordered row ids of the view; `row_values` maps a list of row ids to the values
+      shown, so newly visible rows are formatted together.
+    - Rows are inserted with their row id as iid, so selection and deletion are keyed by id.
+    - Scrolling, resizing, inserts and deletes only re-render the visible window.
+    - Selected rows stay selected while scrolled out of view, but a plain click or key press
+      that replaces the selection drops them; only Shift or Ctrl selections add to them.
+    """
+    # Event state bits of Shift, Control and Command (Mod1), which extend or toggle the selection
+    ADDITIVE_STATE = 0x0001 | 0x0004 | 0x0008
+
+    def __init__(self, parent, columns, row_values, on_heading=None, **kwargs):
+        super().__init__(parent, columns, on_heading, **kwargs)
+
+        self.row_values = row_values
+        self.rows = []
+        self.first = 0
+        self.visible_count = 20
+        self.selected = set()
+        self._materialised = []
+        self._iids = {}
+        self._fitted = False
+        self._replace = False
+        self.scrollbar.configure(command=self._on_scroll)
+
+        self.tree.bind('<Configure>', self._on_resize)
+        self.tree.bind('<MouseWheel>', self._on_mousewheel)
+        self.tree.bind('<Button-4>', lambda event: self.scroll(-3))
+        self.tree.bind('<Button-5>', lambda event: self.scroll(3))
+        self.tree.bind('<ButtonPress-1>', self._on_press, add='+')
+        self.tree.bind('<KeyPress>', self._on_press, add='+')
+        self.tree.bind('<<TreeviewSelect>>', self._on_select)
+
+    def set_rows(self, rows):
+        """Replace the rows of the view and redraw the window from the top."""
+        self.rows = list(rows)
+        self.first = 0
+        self.selected.clear()
+        self._clear()
+        self.render()
+
+    def insert_row(self, index, row_id):
+        """Insert a single row at `index` of the view."""
+        self.rows.insert(index, row_id)
+        # Keep the visible rows in place when something is inserted above them
+        if index < self.first:
+            self.first += 1
+        self.render()
+
+    def delete_rows(self, row_ids):
+        """Remove the given rows from the view in a single pass."""
+        row_ids = set(row_ids)
+        kept = []
+        removed_above = 0
+        for index, row_id in enumerate(self.rows):
+            if row_id in row_ids:
+                if index < self.first:
+                    removed_above += 1
+            else:
+                kept.append(row_id)
+        self.rows = kept
+        self.first -= removed_above
+        self.selected -= row_ids
+        self.render()
+
+    def selection(self):
+        """Return the selected row ids, including rows scrolled out of view."""
+        return list(self.selected)
+
+    def scroll(self, amount):
+        self.first += amount
+        self.render()
+
+    def render(self):
+        """Materialise the rows of the current window, touching only rows that changed."""
+        total = len(self.rows)
+        self.first = max(0, min(self.first, total - self.visible_count))
+        last = min(total, self.first + self.visible_count)
+        window = self.rows[self.first:last]
+
+        keep = set(window)
+        stale = [row_id for row_id in self._materialised if row_id not in keep]
+        if stale:
+            self.tree.delete(*[str(row_id) for row_id in stale])
+            for row_id in stale:
+                del self._iids[str(row_id)]
+
+        new = [(index, row_id) for index, row_id in enumerate(window) if str(row_id) not in self._iids]
+        if new:
+            # Re-selecting rows that scroll back in is not a user selection
+            self._replace = False
+            values = self.row_values([row_id for _, row_id in new])
+            for (index, row_id), row in zip(new, values):
+                iid = str(row_id)
+                self._insert(index, iid, row)
+                self._iids[iid] = row_id
+                if row_id in self.selected:
+                    self.tree.selection_add(iid)
+        self._materialised = window
+
+        if total:
+            self.scrollbar.set(self.first / total, last / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+        if window and not self._fitted:
+            self.tree.after_idle(self._fit)
+
+    def _clear(self):
+        if self._materialised:
+            self.tree.delete(*self._iids)
+        self._materialised = []
+        self._iids = {}
+
+    def _on_scroll(self, *args):
+        if args[0] == 'moveto':
+            self.first = int(float(args[1]) * len(self.rows))
+            self.render()
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            if args[2] == 'pages':
+                step *= self.visible_count
+            self.scroll(step)
+
+    def _on_mousewheel(self, event):
+        self.scroll(-1 if event.delta > 0 else 1)
+
+    def _on_resize(self, event):
+        self._fit()
+
+    def _fit(self):
+        # Work out how many rows fit from the geometry of a materialised row
+        if self._materialised:
+            bbox = self.tree.bbox(str(self._materialised[0]))
+            if bbox:
+                self._fitted = True
+                visible_count = max(1, (self.tree.winfo_height() - bbox[1]) // bbox[3])
+                if visible_count != self.visible_count:
+                    self.visible_count = visible_count
+                    self.render()
+
+    def _on_press(self, event):
+        # Remember whether the selection change that follows replaces or extends the selection
+        self._replace = not event.state & self.ADDITIVE_STATE
+
+    def _on_select(self, event):
+        # Only rows in the window can change selection; off-screen selections are kept unless
+        # the user replaced the selection
+        selected_iids = set(self.tree.selection())
+        if self._replace:
+            self._replace = False
+            self.selected = {row_id for iid, row_id in self._iids.items() if iid in selected_iids}
+            return
+        for iid, row_id in self._iids.items():
+            if iid in selected_iids:
+                self.selected.add(row_id)
+            else:
+                self.selected.discard(row_id)
+
+
+class ExpenseRollup:
+    """
+    Per-category spend in day buckets, kept up to date as expenses are added and removed.
+
+    - Each category has a Fenwick tree over the covered days, so the spend between two dates
+      is an O(log n) prefix-sum query.
+    - Plain day buckets are kept beside the trees; weekly and monthly series are derived from them.
+    - The covered day range doubles (and moves) when an expense falls outside of it.
+    """
+    RESOLUTIONS = ('Daily', 'Weekly', 'Monthly')
+
+    def __init__(self):
+
+        self.base_day = 0
+        self.size = 0
+        self._buckets = {}
+        self._trees = {}
+
+    def add(self, code, day, cents):
+        """Add `cents` (negative to remove) to the bucket of `day` in category `code`."""
+        if self.size == 0 or not self.base_day <= day < self.base_day + self.size:
+            self._cover(day)
+        if code not in self._buckets:
+            self._buckets[code] = np.zeros(self.size, dtype=np.int64)
+            self._trees[code] = [0] * (self.size + 1)
+
+        index = day - self.base_day
+        self._buckets[code][index] += cents
+        tree = self._trees[code]
+        index += 1
+        while index <= self.size:
+            tree[index] += cents
+            index += index & -index
+
+    def rebuild(self, codes, days, cents):
+        """Rebuild every bucket and tree from whole columns in one pass."""
+        self._buckets = {}
+        self._trees = {}
+        self.size = 0
+        if len(days) == 0:
+            return
+        self.base_day = int(days.min())
+        self.size = max(int(days.max()) - self.base_day + 1, 64)
+        for code in np.unique(codes):
+            mask = codes == code
+            buckets = np.zeros(self.size, dtype=np.int64)
+            np.add.at(buckets, days[mask] - self.base_day, cents[mask])
+            self._buckets[int(code)] = buckets
+        self._build_trees()
+
+    def range_sum(self, code, start_day, end_day):
+        """Total cents of category `code` (every category when None) from start_day to end_day inclusive."""
+        codes = self._trees if code is None else [code]
+        return sum(self._prefix(code, end_day) - self._prefix(code, start_day - 1) for code in codes if code in self._trees)
+
+    def series(self, code, start_day, end_day, resolution='Daily'):
+        """
+        Return the spend of a category (every category when None) per day, week or month.
+
+        - Weeks start on Monday; months start on the first.
+        - The result is a Series of dollar amounts indexed by the first day of each period.
+        """
+        days = np.arange(start_day, end_day + 1, dtype=np.int64)
+        values = np.zeros(len(days), dtype=np.int64)
+        low = max(start_day, self.base_day)
+        high = min(end_day + 1, self.base_day + self.size)
+        for bucket_code, buckets in self._buckets.items():
+            if (code is None or bucket_code == code) and low < high:
+                values[low - start_day:high - start_day] += buckets[low - self.base_day:high - self.base_day]
+
+        if resolution == 'Daily':
+            keys = days
+        elif resolution == 'Weekly':
+            # Epoch day 0 was a Thursday
+            keys = days - (days + 3) % 7
+        else:
+            keys = days.astype('datetime64[D]').astype('datetime64[M]').astype('datetime64[D]').astype(np.int64)
+
+        if len(keys) == 0:
+            return pd.Series([], dtype=np.float64)
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        return pd.Series(np.add.reduceat(values, starts) / 100, index=pd.to_datetime(keys[starts], unit='D'))
+
+    def _prefix(self, code, day):
+        # Sum of the buckets up to and including `day`
+        index = min(day - self.base_day + 1, self.size)
+        tree = self._trees[code]
+        total = 0
+        while index > 0:
+            total += tree[index]
+            index -= index & -index
+        return total
+
+    def _cover(self, day):
+        # Grow the covered range geometrically so re-basing stays amortised
+        if self.size == 0:
+            low, size = day, 64
+        else:
+            low = min(self.base_day, day)
+            high = max(self.base_day + self.size, day + 1)
+            size = max(self.size * 2, high - low)
+            if day < self.base_day:
+                low = high - size
+        offset = self.base_day - low
+        for code, buckets in self._buckets.items():
+            grown = np.zeros(size, dtype=np.int64)
+            grown[offset:offset + self.size] = buckets
+            self._buckets[code] = grown
+        self.base_day = low
+        self.size = size
+        self._build_trees()
+
+    def _build_trees(self):
+        # Linear-time Fenwick construction from the day buckets
+        self._trees = {}
+        for code, buckets in self._buckets.items():
+            tree = [0] + buckets.tolist()
+            for index in range(1, self.size + 1):
+                parent = index + (index & -index)
+                if parent <= self.size:
+                    tree[parent] += tree[index]
+            self._trees[code] = tree
+
+
+class ExpenseStore:
+    """
+    Append-only columnar storage for expenses.
+
+    - Columns are growable numpy arrays: dates as int64 epoch days, amounts as int64 cents
+      and categories as small integer codes into `categories`.
+    - Every expense carries a stable row id; a hash index maps row ids to their slot in the columns.
+    - `order` keeps the slots sorted by date, new slots are placed with a binary search.
+    - Deleting marks slots as tombstones in O(1); they are compacted away once they pile up.
+    - Per-category postings and an amount index hold row ids in sorted order, so filters only
+      touch the matching rows.
+    - Category and description sort orders are built the first time a view sorts by them and
+      then kept in order on every add, like the amount index.
+    - Description search uses an inverted index from each word to its slots, with a sorted
+      vocabulary for prefix lookups; it is built on the first search and kept up to date after.
+      Matches are kept as sorted positions in the date order, so results need no id lookups or
+      re-sort, and the matches of recent prefixes are cached until the ledger changes.
+    - Deleted ids stay in the sorted indexes, where readers skip them, until `compact` drops
+      them together with their slots; removing them eagerly would shift every list.
+    - Running per-category totals are updated in O(1) on every add and delete.
+    - `rollup` keeps day-bucket spend per category for time-series and date-range queries.
+    - Display strings are cached per distinct day and amount; the values a view asks for that
+      are not cached yet are formatted together in one vectorized pass, so nothing is formatted twice.
+    - A DataFrame is only built when something asks for one, and is cached until the next change.
+    """
+    NS_PER_DAY = 86_400_000_000_000
+    COMPACT_MIN_TOMBSTONES = 1024
+    SORT_COLUMNS = ('Date', 'Amount', 'Category', 'Description')
+    WORD_PATTERN = re.compile(r'\w+')
+    # Prefixes whose matches are kept between searches; typing a query repeats its short prefixes
+    PREFIX_CACHE_SIZE = 32
+    # Versions are unique across stores, so a view can tell a changed store from a replaced one
+    _versions = itertools.count()
+
+    def __init__(self, categories=(), capacity=1024):
+
+        self.categories = []
+        self._category_codes = {}
+        for category in categories:
+            self.category_code(category)
+
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._dates = np.zeros(capacity, dtype=np.int64)
+        self._amounts = np.zeros(capacity, dtype=np.int64)
+        self._codes = np.zeros(capacity, dtype=np.int16)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._descriptions = []
+        self._size = 0
+        self._tombstones = 0
+        self._slot_of = {}
+        self.next_id = 0
+        self.order = []
+        self._postings = {}
+        self._by_amount = []
+        self._sort_orders = {}
+        self._terms = None
+        self._term_slots = {}
+        self._prefix_ranks = {}
+        self._vocabulary = []
+        self._deleted = set()
+        self._order_slots = None
+        self._order_ranks = None
+        self._order_ids = None
+        self._totals = {}
+        self.rollup = ExpenseRollup()
+        self._date_texts = {}
+        self._amount_texts = {}
+        self._frame = None
+        self.version = next(self._versions)
+
+    def __len__(self):
+        return self._size - self._tombstones
+
+    def __contains__(self, row_id):
+        slot = self._slot_of.get(row_id)
+        return slot is not None and bool(self._alive[slot])
+
+    def category_code(self, category):
+        """Return the code of a category, registering it if it is new."""
+        code = self._category_codes.get(category)
+        if code is None:
+            code = len(self.categories)
+            self.categories.append(category)
+            self._category_codes[category] = code
+        return code
+
+    def amount_key(self, row_id):
+        """Amount in cents of a row id."""
+        return self._amounts[self._slot_of[row_id]]
+
+    def to_day(self, date):
+        """Convert a date or Timestamp to epoch days."""
+        return pd.Timestamp(date).value // self.NS_PER_DAY
+
+    def to_cents(self, amount):
+        """
+        Convert an amount to whole cents with the same rounding as `amounts_to_cents`.
+
+        - Raises ValueError for NaN and infinite amounts, which have no cents value.
+        """
+        if not math.isfinite(amount):
+            raise ValueError(f"{amount} is not a valid amount")
+        return int(self.amounts_to_cents([amount])[0])
+
+    @staticmethod
+    def amounts_to_cents(amounts):
+        """
+        Convert amounts to whole cents, rounding halves away from zero, in one vectorized pass.
+
+        - Amount * 100 is first snapped to 6 decimals, so a value such as 1.005, stored in
+          binary as 1.00499..., rounds up to 101 as written rather than down to 100.
+        """
+        cents = np.round(np.asarray(amounts, dtype=np.float64) * 100, 6)
+        return (np.sign(cents) * np.floor(np.abs(cents) + 0.5)).astype(np.int64)
+
+    def append(self, date, amount, category, description):
+        """
+        Append a single expense and return its row id.
+
+        - The amount is stored as whole cents, rounded half up.
+        - The slot is placed in `order` after any expense on the same date.
+        """
+        return self.add_row(self.next_id, self.to_day(date), self.to_cents(amount), category, description)
+
+    def add_row(self, row_id, day, cents, category, description):
+        """Append an expense with a known row id, epoch day and amount in cents."""
+        self._reserve(1)
+        slot = self._size
+        self.next_id = max(self.next_id, row_id + 1)
+        code = self.category_code(category)
+
+        self._ids[slot] = row_id
+        self._dates[slot] = day
+        self._amounts[slot] = cents
+        self._codes[slot] = code
+        self._alive[slot] = True
+        self._descriptions.append(description)
+        self._slot_of[row_id] = slot
+        self._size += 1
+        self._totals[code] = self._totals.get(code, 0) + cents
+        self.rollup.add(code, day, cents)
+
+        # Expenses are usually added in date order, so appending is the common case
+        if not self.order or day >= self._dates[self.order[-1]]:
+            self.order.append(slot)
+        else:
+            self.order.insert(bisect.bisect_right(self.order, day, key=self._dates.__getitem__), slot)
+        self._insert_sorted(self._postings.setdefault(code, []), row_id, self._date_id_key)
+        self._insert_sorted(self._by_amount, row_id, self._amount_id_key)
+        for column, rows in self._sort_orders.items():
+            self._insert_sorted(rows, row_id, self.sort_key(column))
+        if self._terms is not None:
+            self._index_words(slot, description)
+        self._changed()
+        return row_id
+
+    def extend(self, frame, reindex=True):
+        """
+        Append every row of a DataFrame with Date, Amount, Category and Description columns.
+
+        - With `reindex=False` the new slots are only appended, leaving the date order and
+          indexes stale until `reindex` is called; bulk loads use this to sort once at the end.
+        """
+        count = len(frame)
+        if count == 0:
+            return []
+        self._reserve(count)
+        start = self._size
+        stop = start + count
+        row_ids = range(self.next_id, self.next_id + count)
+        self.next_id += count
+
+        # Expenses without a category are filed under Others, as in the category picker
+        local_codes, uniques = pd.factorize(frame['Category'].fillna('Others'))
+        code_map = np.array([self.category_code(category) for category in uniques], dtype=np.int16)
+
+        self._ids[start:stop] = np.arange(row_ids.start, row_ids.stop, dtype=np.int64)
+        self._dates[start:stop] = frame['Date'].to_numpy(dtype='datetime64[ns]').astype('datetime64[D]').astype(np.int64)
+        self._amounts[start:stop] = self.amounts_to_cents(frame['Amount'].to_numpy(dtype=np.float64))
+        self._codes[start:stop] = code_map[local_codes]
+        self._alive[start:stop] = True
+        self._descriptions.extend(frame['Description'].fillna('').astype(str).tolist())
+        self._slot_of.update(zip(row_ids, range(start, stop)))
+        self._size = stop
+
+        slots = np.arange(start, stop, dtype=np.int64)
+        if not reindex:
+            self.order.extend(slots.tolist())
+            self._changed()
+            return list(row_ids)
+
+        # Merge the new slots into the date order with one stable sort of the combined slots
+        slots = slots[np.argsort(self._dates[start:stop], kind='stable')]
+        if self.order and self._dates[slots[0]] < self._dates[self.order[-1]]:
+            combined = np.concatenate([np.array(self.order, dtype=np.int64), slots])
+            self.order = combined[np.argsort(self._dates[combined], kind='stable')].tolist()
+        else:
+            self.order.extend(slots.tolist())
+        self._rebuild_indexes()
+        self._changed()
+        return list(row_ids)
+
+    def delete(self, row_ids):
+        """
+        Delete expenses by row id and return the ids that were removed.
+
+        - Each delete is a hash lookup plus a tombstone, so k deletes cost O(k); the id is
+          left in the sorted indexes until the next compaction.
+        - Unknown or already deleted ids are ignored.
+        """
+        deleted = []
+        for row_id in row_ids:
+            slot = self._slot_of.get(row_id)
+            if slot is None or not self._alive[slot]:
+                continue
+            code = int(self._codes[slot])
+            self._deleted.add(row_id)
+            self._totals[code] -= int(self._amounts[slot])
+            self.rollup.add(code, int(self._dates[slot]), -int(self._amounts[slot]))
+            self._alive[slot] = False
+            deleted.append(row_id)
+        self._tombstones += len(deleted)
+        if deleted:
+            self._changed()
+        if self._tombstones > self.COMPACT_MIN_TOMBSTONES and self._tombstones * 4 > self._size:
+            self.compact()
+        return deleted
+
+    def compact(self):
+        """Drop tombstoned slots from the columns and the date order, and deleted ids from the indexes."""
+        live = np.flatnonzero(self._alive[:self._size])
+        # Slot numbers shift down, so remap the date order through the old->new table
+        remap = np.full(self._size, -1, dtype=np.int64)
+        remap[live] = np.arange(len(live), dtype=np.int64)
+        order = remap[np.array(self.order, dtype=np.int64)] if self.order else np.zeros(0, dtype=np.int64)
+
+        # Columns may still be the arrays adopted by `from_columns`, so compact into new arrays
+        for name in ('_ids', '_dates', '_amounts', '_codes', '_alive'):
+            column = getattr(self, name)
+            compacted = np.zeros(len(column), dtype=column.dtype)
+            compacted[:len(live)] = column[live]
+            setattr(self, name, compacted)
+        self._descriptions = [self._descriptions[slot] for slot in live]
+        self._size = len(live)
+        self._tombstones = 0
+        self._slot_of = dict(zip(self._ids[:self._size].tolist(), range(self._size)))
+        self.order = order[order >= 0].tolist()
+        self._order_slots = None
+        self._order_ranks = None
+        self._order_ids = None
+        if self._terms is not None:
+            terms = {}
+            for word, slots in self._terms.items():
+                slots = remap[np.array(slots, dtype=np.int64)]
+                slots = slots[slots >= 0]
+                if len(slots):
+                    terms[word] = slots.tolist()
+            self._terms = terms
+            self._term_slots = {}
+            self._prefix_ranks = {}
+            self._vocabulary = sorted(terms)
+
+        deleted = self._deleted
+        if deleted:
+            self._postings = {code: [row_id for row_id in rows if row_id not in deleted]
+                              for code, rows in self._postings.items()}
+            self._by_amount = [row_id for row_id in self._by_amount if row_id not in deleted]
+            self._sort_orders = {column: [row_id for row_id in rows if row_id not in deleted]
+                                 for column, rows in self._sort_orders.items()}
+            self._deleted = set()
+
+    def columns(self):
+        """Return the live expenses as columns in date order, as saved by SqliteExpenseFormat."""
+        slots = np.array(self.order, dtype=np.int64)
+        slots = slots[self._alive[slots]]
+        return {
+            'categories': list(self.categories),
+            'next_id': self.next_id,
+            'ids': self._ids[slots],
+            'dates': self._dates[slots],
+            'amounts': self._amounts[slots],
+            'codes': self._codes[slots],
+            'descriptions': [self._descriptions[slot] for slot in slots],
+        }
+
+    @classmethod
+    def from_columns(cls, categories, next_id, ids, dates, amounts, codes, descriptions):
+        """
+        Build a store around columns in date order, as returned by `columns`.
+
+        - The numeric arrays are adopted as they are, without copying; they are only copied
+          once the store needs to grow or compact them.
+        """
+        store = cls(categories, capacity=0)
+        size = len(ids)
+        store._ids = ids
+        store._dates = dates
+        store._amounts = amounts
+        store._codes = codes
+        store._alive = np.ones(size, dtype=bool)
+        store._descriptions = list(descriptions)
+        store._size = size
+        store.next_id = max(int(next_id), int(ids.max()) + 1 if size else 0)
+        store._slot_of = dict(zip(ids.tolist(), range(size)))
+        store.order = list(range(size))
+        store._rebuild_indexes()
+        return store
+
+    def category_totals(self):
+        """Return the total amount of every category that has expenses, from the running totals."""
+        return {self.categories[code]: cents / 100 for code, cents in sorted(self._totals.items()) if cents}
+
+    def spend(self, category=None, start=None, end=None):
+        """Total amount of a category (every category when None) between two dates, from the rollup."""
+        if category is not None and category not in self._category_codes:
+            return 0.0
+        code = None if category is None else self._category_codes[category]
+        start_day = self.rollup.base_day if start is None else self.to_day(start)
+        end_day = self.rollup.base_day + self.rollup.size - 1 if end is None else self.to_day(end)
+        return self.rollup.range_sum(code, start_day, end_day) / 100
+
+    def spend_series(self, category=None, resolution='Daily'):
+        """Spend of a category (every category when None) per day, week or month over the whole ledger."""
+        if not len(self):
+            return pd.Series([], dtype=np.float64)
+        code = None if category is None else self._category_codes.get(category, -1)
+        return self.rollup.series(code, int(self._dates[self.order[0]]), int(self._dates[self.order[-1]]), resolution)
+
+    def total(self, row_ids):
+        """Total amount of the given row ids."""
+        slots = np.fromiter((self._slot_of[row_id] for row_id in row_ids), dtype=np.int64, count=len(row_ids))
+        return int(self._amounts[slots].sum()) / 100
+
+    def sort_key(self, column):
+        """Return the function giving a row id's sort key for a column; the row id breaks any tie."""
+        if column == 'Amount':
+            return self._amount_id_key
+        if column == 'Category':
+            return self._category_key
+        if column == 'Description':
+            return self._description_key
+        return self._date_id_key
+
+    def sorted_rows(self, column='Date', reverse=False, row_ids=None):
+        """
+        Return live row ids ordered by a column, read from its maintained sort order.
+
+        - `row_ids`, such as a filter result in date order, restricts the result to those rows;
+          a small subset is sorted directly, a large one is picked out of the sort order.
+        """
+        if column == 'Date':
+            rows = self.rows() if row_ids is None else list(row_ids)
+        elif row_ids is None:
+            deleted = self._deleted
+            rows = [row_id for row_id in self._sort_order(column) if row_id not in deleted] if deleted \
+                else list(self._sort_order(column))
+        elif len(row_ids) * 16 < len(self):
+            rows = sorted(row_ids, key=self.sort_key(column))
+        else:
+            keep = set(row_ids)
+            rows = [row_id for row_id in self._sort_order(column) if row_id in keep]
+        if reverse:
+            rows.reverse()
+        return rows
+
+    def rows(self):
+        """Return the live row ids in date order."""
+        order = self._date_order()
+        return self._ids[order[self._alive[order]]].tolist()
+
+    def query(self, category=None, start=None, end=None, min_amount=None, max_amount=None, text=None):
+        """
+        Return the live row ids in date order that match every given filter.
+
+        - Each filter narrows to a contiguous run of a sorted index: the category postings,
+          the date order or the amount index.
+        - `text` keeps the rows whose description has a word starting with each of its words,
+          looked up in the inverted index.
+        - The smallest run is intersected with the other filters, so the cost follows the
+          number of candidate rows rather than the size of the ledger.
+        """
+        candidates = []
+        words = self.words(text) if text else []
+        if words:
+            matched = self._text_ranks(words)
+            candidates.append((len(matched), 'text', matched))
+
+        if category is not None:
+            code = self._category_codes.get(category)
+            postings = self._postings.get(code, [])
+            candidates.append((len(postings), 'category', postings))
+
+        start_day = None if start is None else self.to_day(start)
+        end_day = None if end is None else self.to_day(end)
+        if start_day is not None or end_day is not None:
+            low = 0 if start_day is None else bisect.bisect_left(self.order, start_day, key=self._dates.__getitem__)
+            high = len(self.order) if end_day is None else bisect.bisect_right(self.order, end_day, key=self._dates.__getitem__)
+            candidates.append((high - low, 'date', (low, high)))
+
+        min_cents = None if min_amount is None else self.to_cents(min_amount)
+        max_cents = None if max_amount is None else self.to_cents(max_amount)
+        if min_cents is not None or max_cents is not None:
+            low = 0 if min_cents is None else bisect.bisect_left(self._by_amount, min_cents, key=self.amount_key)
+            high = len(self._by_amount) if max_cents is None else bisect.bisect_right(self._by_amount, max_cents, key=self.amount_key)
+            candidates.append((high - low, 'amount', self._by_amount[low:high]))
+
+        if not candidates:
+            return self.rows()
+        size, driver, rows = min(candidates, key=lambda candidate: candidate[0])
+        if size <= 0:
+            return []
+
+        if driver == 'date':
+            slots = np.array(self.order[rows[0]:rows[1]], dtype=np.int64)
+            slots = slots[self._alive[slots]]
+        elif driver == 'text':
+            # The matches are live positions in the date order, so the rows come out sorted
+            slots = self._date_order()[rows]
+        else:
+            slots = np.fromiter((self._slot_of[row_id] for row_id in rows), dtype=np.int64, count=len(rows))
+
+        # Intersect the driving rows with the remaining filters; the indexes may still hold deleted rows
+        mask = np.ones(len(slots), dtype=bool) if driver == 'text' else self._alive[slots]
+        if category is not None and driver != 'category':
+            mask &= self._codes[slots] == self._category_codes[category]
+        if start_day is not None and driver != 'date':
+            mask &= self._dates[slots] >= start_day
+        if end_day is not None and driver != 'date':
+            mask &= self._dates[slots] <= end_day
+        if min_cents is not None and driver != 'amount':
+            mask &= self._amounts[slots] >= min_cents
+        if max_cents is not None and driver != 'amount':
+            mask &= self._amounts[slots] <= max_cents
+        if words and driver != 'text':
+            # The matches are sorted, so each driving row is looked up with a binary search
+            ranks = self._date_ranks()[slots]
+            found = np.searchsorted(matched, ranks)
+            mask &= matched[np.minimum(found, len(matched) - 1)] == ranks
+        if driver == 'text':
+            # Reading the ids in date order too keeps the lookup sequential
+            return self._date_ids()[rows[mask]].tolist()
+        slots = slots[mask]
+
+        if driver == 'amount':
+            slots = slots[np.lexsort((self._ids[slots], self._dates[slots]))]
+        return self._ids[slots].tolist()
+
+    def matches(self, row_id, category=None, start=None, end=None, min_amount=None, max_amount=None, text=None):
+        """Check a single row against the same filters as `query`."""
+        slot = self._slot_of[row_id]
+        if text:
+            own = self.words(self._descriptions[slot])
+            if not all(any(word.startswith(prefix) for word in own) for prefix in self.words(text)):
+                return False
+        if category is not None and self.categories[self._codes[slot]] != category:
+            return False
+        if start is not None and self._dates[slot] < self.to_day(start):
+            return False
+        if end is not None and self._dates[slot] > self.to_day(end):
+            return False
+        if min_amount is not None and self._amounts[slot] < self.to_cents(min_amount):
+            return False
+        if max_amount is not None and self._amounts[slot] > self.to_cents(max_amount):
+            return False
+        return True
+
+    def words(self, text):
+        """Split text into the lowercase words the search index uses."""
+        return self.WORD_PATTERN.findall(text.casefold())
+
+    def _text_ranks(self, words):
+        # Sorted date-order positions of the slots whose description has a word starting with
+        # each given word; deleted slots are left in for the caller to skip
+        self._search_index()
+        ranks = None
+        for prefix in set(words):
+            hits = self._prefix_hits(prefix)
+            ranks = hits if ranks is None else np.intersect1d(ranks, hits, assume_unique=True)
+        return ranks
+
+    def _prefix_hits(self, prefix):
+        # Each prefix selects a contiguous run of the sorted vocabulary; the union of its postings
+        # is cached, without deleted slots, until the ledger changes
+        hits = self._prefix_ranks.get(prefix)
+        if hits is None:
+            low = bisect.bisect_left(self._vocabulary, prefix)
+            high = bisect.bisect_left(self._vocabulary, prefix + '\U0010ffff', low)
+            ranks = self._date_ranks()
+            marked = np.zeros(self._size, dtype=bool)
+            for word in self._vocabulary[low:high]:
+                marked[ranks[self._word_slots(word)]] = True
+            hits = np.flatnonzero(marked)
+            if self._tombstones:
+                hits = hits[self._alive[self._date_order()[hits]]]
+            if len(self._prefix_ranks) >= self.PREFIX_CACHE_SIZE:
+                self._prefix_ranks.pop(next(iter(self._prefix_ranks)))
+            self._prefix_ranks[prefix] = hits
+        return hits
+
+    def _word_slots(self, word):
+        slots = self._term_slots.get(word)
+        if slots is None:
+            slots = self._term_slots[word] = np.array(self._terms[word], dtype=np.int64)
+        return slots
+
+    def raw_row(self, row_id):
+        """Return (day, cents, category, description) of a row id as stored."""
+        slot = self._slot_of[row_id]
+        return (int(self._dates[slot]), int(self._amounts[slot]),
+                self.categories[self._codes[slot]], self._descriptions[slot])
+
+    def display_rows(self, row_ids):
+        """Return (date, amount, category, description) display strings for each row id."""
+        slots = [self._slot_of[row_id] for row_id in row_ids]
+        days = self._dates[slots].tolist()
+        cents = self._amounts[slots].tolist()
+        codes = self._codes[slots].tolist()
+        self._cache_display(days, cents)
+        return [(self._date_texts[day], self._amount_texts[amount], self.categories[code], self._descriptions[slot])
+                for slot, day, amount, code in zip(slots, days, cents, codes)]
+
+    def to_dataframe(self):
+        """Build (or reuse) a DataFrame of the ledger in date order, indexed by row id."""
+        if self._frame is None:
+            slots = np.array(self.order, dtype=np.int64)
+            slots = slots[self._alive[slots]]
+            self._frame = pd.DataFrame({
+                'Date': pd.to_datetime(self._dates[slots], unit='D'),
+                'Amount': self._amounts[slots] / 100,
+                'Category': np.array(self.categories, dtype=object)[self._codes[slots]] if len(slots) else [],
+                'Description': [self._descriptions[slot] for slot in slots],
+            }, index=self._ids[slots])
+        return self._frame
+
+    def _date_id_key(self, row_id):
+        return (self._dates[self._slot_of[row_id]], row_id)
+
+    def _amount_id_key(self, row_id):
+        return (self._amounts[self._slot_of[row_id]], row_id)
+
+    def _category_key(self, row_id):
+        slot = self._slot_of[row_id]
+        return (self.categories[self._codes[slot]], self._dates[slot], row_id)
+
+    def _description_key(self, row_id):
+        slot = self._slot_of[row_id]
+        return (self._descriptions[slot].casefold(), self._dates[slot], row_id)
+
+    def search_snapshot(self):
+        """Return the live slots in ascending order and their descriptions, to build the search index from."""
+        slots = np.flatnonzero(self._alive[:self._size])
+        return slots.tolist(), [self._descriptions[slot] for slot in slots.tolist()]
+
+    @classmethod
+    def build_search_index(cls, slots, descriptions):
+        """Map each word to the slots of the rows using it, from slots in ascending order; safe off the Tk thread."""
+        findall = cls.WORD_PATTERN.findall
+        terms = {}
+        for slot, description in zip(slots, descriptions):
+            for word in set(findall(description.casefold())):
+                rows = terms.get(word)
+                if rows is None:
+                    terms[word] = [slot]
+                else:
+                    rows.append(slot)
+        return terms
+
+    def install_search_index(self, terms, version):
+        """
+        Use a search index built in the background, unless the ledger changed since its snapshot.
+
+        - Returns False when the index is stale, as its slots may have moved; True once the
+          store has an index.
+        """
+        if self._terms is not None:
+            return True
+        if version != self.version:
+            return False
+        self._terms = terms
+        self._term_slots = {}
+        self._prefix_ranks = {}
+        self._vocabulary = sorted(terms)
+        return True
+
+    def _search_index(self):
+        # Build the inverted index here if a search comes before the background build
+        if self._terms is None:
+            self.install_search_index(self.build_search_index(*self.search_snapshot()), self.version)
+        return self._terms
+
+    def _index_words(self, slot, description):
+        # New rows always take the highest slot, so the postings stay sorted by appending
+        for word in set(self.words(description)):
+            slots = self._terms.get(word)
+            if slots is None:
+                self._terms[word] = [slot]
+                bisect.insort(self._vocabulary, word)
+            else:
+                slots.append(slot)
+                self._term_slots.pop(word, None)
+
+    def _sort_order(self, column):
+        # Amounts are always indexed for filtering; the other orders are built on first use
+        if column == 'Amount':
+            return self._by_amount
+        rows = self._sort_orders.get(column)
+        if rows is None:
+            order = np.array(self.order, dtype=np.int64)
+            slots = order[self._alive[order]]
+            ids = self._ids[slots]
+            if column == 'Category':
+                ranks = np.argsort(np.argsort(np.array(self.categories, dtype=str)))
+                primary = ranks[self._codes[slots]]
+            else:
+                primary = np.array([self._descriptions[slot].casefold() for slot in slots.tolist()], dtype=str)
+            rows = self._sort_orders[column] = ids[np.lexsort((ids, self._dates[slots], primary))].tolist()
+        return rows
+
+    def _insert_sorted(self, rows, row_id, key):
+        if not rows or key(rows[-1]) <= key(row_id):
+            rows.append(row_id)
+        else:
+            bisect.insort(rows, row_id, key=key)
+
+    def reindex(self):
+        """Sort the date order and rebuild the indexes after appends with `reindex=False`."""
+        if self.order:
+            order = np.array(self.order, dtype=np.int64)
+            self.order = order[np.argsort(self._dates[order], kind='stable')].tolist()
+        self._rebuild_indexes()
+        self._changed()
+
+    def _rebuild_indexes(self):
+        # Rebuild the postings and amount index from the date order after a bulk append
+        order = np.array(self.order, dtype=np.int64)
+        slots = order[self._alive[order]]
+        ids = self._ids[slots]
+        codes = self._codes[slots]
+        amounts = self._amounts[slots]
+        self._postings = {int(code): ids[codes == code].tolist() for code in np.unique(codes)}
+        self._totals = {int(code): int(amounts[codes == code].sum()) for code in np.unique(codes)}
+        self._by_amount = ids[np.lexsort((ids, amounts))].tolist()
+        self._sort_orders = {}
+        self._terms = None
+        self._term_slots = {}
+        self._prefix_ranks = {}
+        self._vocabulary = []
+        self._deleted = set()
+        self.rollup.rebuild(codes, self._dates[slots], amounts)
+
+    def _cache_display(self, days, cents):
+        # Format only the distinct days and amounts the caches have not seen yet
+        days = {day for day in days if day not in self._date_texts}
+        if days:
+            self._date_texts.update(zip(days, format_days(list(days))))
+        cents = {amount for amount in cents if amount not in self._amount_texts}
+        if cents:
+            self._amount_texts.update(zip(cents, format_cents(list(cents))))
+
+    def _changed(self):
+        # Drop the cached DataFrame, date order and prefix matches and let views such as the chart know the ledger changed
+        self._frame = None
+        self._order_slots = None
+        self._order_ranks = None
+        self._order_ids = None
+        self._prefix_ranks = {}
+        self.version = next(self._versions)
+
+    def _date_order(self):
+        # The date order as an array of slots, cached until the ledger changes
+        if self._order_slots is None:
+            self._order_slots = np.array(self.order, dtype=np.int64)
+        return self._order_slots
+
+    def _date_ids(self):
+        # The row ids in date order, cached with it
+        if self._order_ids is None:
+            self._order_ids = self._ids[self._date_order()]
+        return self._order_ids
+
+    def _date_ranks(self):
+        # The position of every slot in the date order, cached with it
+        if self._order_ranks is None:
+            order = self._date_order()
+            self._order_ranks = np.zeros(self._size, dtype=np.int64)
+            self._order_ranks[order] = np.arange(len(order), dtype=np.int64)
+        return self._order_ranks
+
+    def _reserve(self, extra):
+        # Grow every column geometrically so appends stay amortised O(1)
+        needed = self._size + extra
+        capacity = len(self._dates)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2, 16)
+        for name in ('_ids', '_dates', '_amounts', '_codes', '_alive'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+
+class SqliteExpenseFormat:
+    """
+    Expense storage as rows of the shared SQLite database.
+
+    - Changes since the last save are written row by row through ExpenseJournal.
+    - `save` replaces every row, and is only used after an import replaced the whole ledger.
+    - The 'expenses' setting holds the categories and next row id; every save writes it, so it
+      also records that the ledger was saved, even when every row has since been deleted.
+    """
+    def __init__(self, database):
+        self.database = database
+        self.path = database.path
+
+    def journal(self):
+        return ExpenseJournal(self.database)
+
+    def exists(self):
+        return self.database.get_setting('expenses') is not None
+
+    def save(self, columns):
+        codes = columns['codes'].tolist()
+        categories = columns['categories']
+        rows = zip(columns['ids'].tolist(), columns['dates'].tolist(), columns['amounts'].tolist(),
+                   (categories[code] for code in codes), columns['descriptions'])
+        with self.database.transaction() as connection:
+            connection.execute("DELETE FROM expenses")
+            connection.executemany(
+                "INSERT INTO expenses (id, day, cents, category, description) VALUES (?, ?, ?, ?, ?)", rows)
+            self.database.set_setting(connection, 'expenses', {'categories': categories, 'next_id': columns['next_id']})
+
+    def load(self):
+        meta = self.database.get_setting('expenses', {})
+        rows = self.database.query("SELECT id, day, cents, category, description FROM expenses ORDER BY day, id")
+
+        categories = list(meta.get('categories', []))
+        category_codes = {category: code for code, category in enumerate(categories)}
+        codes = []
+        for row in rows:
+            code = category_codes.get(row[3])
+            if code is None:
+                code = category_codes[row[3]] = len(categories)
+                categories.append(row[3])
+            codes.append(code)
+
+        return {
+            'categories': categories,
+            'next_id': meta.get('next_id', 0),
+            'ids': np.array([row[0] for row in rows], dtype=np.int64),
+            'dates': np.array([row[1] for row in rows], dtype=np.int64),
+            'amounts': np.array([row[2] for row in rows], dtype=np.int64),
+            'codes': np.array(codes, dtype=np.int16),
+            'descriptions': [row[4] for row in rows],
+        }
+
+
+class ExpenseJournal:
+    """
+    Change log of expense adds and deletes since the last save.
+
+    - Every operation gets an increasing sequence number.
+    - `flush` writes the pending operations straight into the expenses table in one
+      transaction, touching only the changed rows, so a save costs O(changes).
+    - Operations are recorded on the Tk thread and flushed on an I/O worker; `_pending_lock`
+      guards the hand-over.
+    """
+    def __init__(self, database):
+
+        self.database = database
+        self.seq = 0
+        self.pending = []
+        self._pending_lock = threading.Lock()
+
+    def record_add(self, row_id, day, cents, category, description):
+        self.seq += 1
+        with self._pending_lock:
+            self.pending.append({'seq': self.seq, 'op': 'add', 'id': row_id, 'day': day, 'cents': cents,
+                                 'category': category, 'description': description})
+
+    def record_delete(self, row_ids):
+        self.seq += 1
+        with self._pending_lock:
+            self.pending.append({'seq': self.seq, 'op': 'delete', 'ids': list(row_ids)})
+
+    def discard_pending(self):
+        with self._pending_lock:
+            self.pending = []
+
+    def take_pending(self, upto_seq=None):
+        """Remove and return the pending operations up to `upto_seq` (all of them by default)."""
+        with self._pending_lock:
+            if upto_seq is None:
+                taken, self.pending = self.pending, []
+            else:
+                taken = [operation for operation in self.pending if operation['seq'] <= upto_seq]
+                self.pending = self.pending[len(taken):]
+            return taken
+
+    def restore_pending(self, operations):
+        """Put back operations whose write failed, ahead of anything recorded since."""
+        with self._pending_lock:
+            self.pending = operations + self.pending
+
+    def flush(self, upto_seq=None):
+        """Write the pending operations up to `upto_seq` to the expenses table and return how many were written."""
+        operations = self.take_pending(upto_seq)
+        if not operations:
+            return 0
+        try:
+            with self.database.transaction() as connection:
+                for operation in operations:
+                    if operation['op'] == 'add':
+                        connection.execute(
+                            "INSERT OR REPLACE INTO expenses (id, day, cents, category, description) VALUES (?, ?, ?, ?, ?)",
+                            (operation['id'], operation['day'], operation['cents'],
+                             operation['category'], operation['description']))
+                    else:
+                        connection.executemany("DELETE FROM expenses WHERE id = ?", [(row_id,) for row_id in operation['ids']])
+                self._update_meta(connection, operations)
+        except Exception:
+            self.restore_pending(operations)
+            raise
+        return len(operations)
+
+    # Keep the categories and next row id of the saved ledger in step with the added rows
+    def _update_meta(self, connection, operations):
+        row = connection.execute("SELECT value FROM settings WHERE key = 'expenses'").fetchone()
+        meta = json.loads(row[0]) if row else {}
+        categories = meta.setdefault('categories', [])
+        next_id = meta.get('next_id', 0)
+        for operation in operations:
+            if operation['op'] == 'add':
+                next_id = max(next_id, operation['id'] + 1)
+                if operation['category'] not in categories:
+                    categories.append(operation['category'])
+        meta['next_id'] = next_id
+        self.database.set_setting(connection, 'expenses', meta)
+
+
+class ChunkedCSVLoader:
+    """
+    Streams a CSV file into the Tk thread chunk by chunk.
+
+    - A worker thread reads the file with `pd.read_csv(chunksize=...)` and optionally
+      prepares each chunk before handing it over.
+    - Chunks travel through a small bounded queue, so memory is bounded by the chunk size.
+    - The Tk thread polls the queue with `root.after` and calls `on_chunk(chunk)`,
+      `on_progress(fraction)`, `on_done()` and `on_error(exception)`.
+    """
+    CHUNK_SIZE = 50_000
+    POLL_MS = 50
+
+    def __init__(self, root, file_path, on_chunk, on_progress, on_done, on_error,
+                 prepare=None, chunksize=CHUNK_SIZE, **read_csv_kwargs):
+
+        self.root = root
+        self.file_path = file_path
+        self.on_chunk = on_chunk
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.on_error = on_error
+        self.prepare = prepare
+        self.chunksize = chunksize
+        self.read_csv_kwargs = read_csv_kwargs
+        self._queue = queue.Queue(maxsize=2)
+        self._cancelled = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._read, daemon=True)
+        self._thread.start()
+        self.root.after(self.POLL_MS, self._poll)
+
+    def cancel(self):
+        """Stop reading; chunks that were not handed over yet are dropped."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    # Worker thread: read and prepare chunks, blocking while the queue is full
+    def _read(self):
+        try:
+            size = max(os.path.getsize(self.file_path), 1)
+            with open(self.file_path, 'rb') as file:
+                for chunk in pd.read_csv(file, chunksize=self.chunksize, **self.read_csv_kwargs):
+                    if self.prepare is not None:
+                        chunk = self.prepare(chunk)
+                    if not self._put(('chunk', chunk, min(file.tell() / size, 1.0))):
+                        return
+            self._put(('done', None, 1.0))
+        except Exception as e:
+            self._put(('error', e, None))
+
+    def _put(self, item):
+        while not self._cancelled.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    # Tk thread: hand over whatever the worker has produced since the last poll
+    def _poll(self):
+        while not self._cancelled.is_set():
+            try:
+                kind, payload, progress = self._queue.get_nowait()
+            except queue.Empty:
+                self.root.after(self.POLL_MS, self._poll)
+                return
+
+            if kind == 'chunk':
+                try:
+                    self.on_chunk(payload)
+                except Exception as e:
+                    self.cancel()
+                    self.on_error(e)
+                    return
+                self.on_progress(progress)
+            elif kind == 'done':
+                self.on_progress(progress)
+                try:
+                    self.on_done()
+                except Exception as e:
+                    self.on_error(e)
+                return
+            else:
+                self.on_error(payload)
+                return
+
 
 class ExpenseTracker(mainWindow):
     """
@@ -127,24 +1810,43 @@ class ExpenseTracker(mainWindow):
 
     Responsibilities:
     - Allows users to add, visualize, save, and load expenses.
+    - Saves to the expenses table of the shared SQLite database, writing only the rows changed
+      since the last save; CSV is used for import and export.
     - Implements a structured GUI for input and visualization.
     - Ensures proper file handling and data validation.
     """
+    # Column types of the expenses CSV, given explicitly so pandas does not infer them
+    CSV_DTYPES = {'Date': 'object', 'Amount': 'float64', 'Category': 'object', 'Description': 'object'}
+    CSV_DATE_FORMAT = '%Y-%m-%d'
+    # Pause in typing, in milliseconds, before the description search runs
+    SEARCH_DELAY_MS = 200
+
     def __init__(self, title, root_window, mainApp):
 
         self.root = root_window
         self.mainApp = mainApp
-        self.root.title(title)
+        self.window_title = title
         self.current_frame = ttk.Frame(self.root)
-        self.current_frame.pack(fill='both')
         self.style = tb.Style()
-        self.style.configure('.', font=("Helvetica", 12))
         # Initialise expense data and categories
-        self.expense_df = pd.DataFrame(columns=['Date', 'Amount', 'Category', 'Description'])
         self.categories = ["Food", "Transportation", "Utilities", "Entertainment", "Others"]
+        self.store = ExpenseStore(self.categories)
+        self.io = mainApp.io
+        self.storage = SqliteExpenseFormat(mainApp.database)
+        self.csv_path = "expense_data/expenses.csv"
+        self.journal = self.storage.journal()
+        self.snapshot_required = False
+        self.loader = None
+        self.chart_window = None
+        self.chart_version = None
+        self.search_job = None
+        # Edits wait for the saved ledger, so nothing is journaled against the empty placeholder store
+        self.loaded = False
 
         self.setupUi()
         self.createDirectories()
+        self.open_saved_Expenses()
+        mainApp.exit_hooks['expenses'] = self.save_on_exit
         
 
     # Create directory for new expense file if it doesn't exist
@@ -157,7 +1859,7 @@ class ExpenseTracker(mainWindow):
     def setupUi(self):
         
         # Frame for input widgets
-        inputFrame = ttk.LabelFrame(self.root, text= 'Add Expense', bootstyle='info', padding=(10,10))
+        inputFrame = ttk.LabelFrame(self.current_frame, text= 'Add Expense', bootstyle='info', padding=(10,10))
         inputFrame.pack(padx=10, pady=10, fill='x')
 
         # Input fields for expense details
@@ -190,32 +1892,64 @@ class ExpenseTracker(mainWindow):
         self.filterCombo.grid(row=1, column=3, padx=5, pady=5)
         self.filterCombo.set('All')
 
-        self.cancel_filter_button = ttk.Button(inputFrame, text='Cancel Filter', bootstyle='info', command= lambda: self.filterCombo.set('All'))
+        self.cancel_filter_button = ttk.Button(inputFrame, text='Cancel Filter', bootstyle='info', command=self.cancel_filter)
         self.cancel_filter_button.grid(row=1, column=4, padx=5, pady=5) 
 
+        # Date (YYYY-MM-DD) and amount ranges, combined with the category filter
+        ttk.Label(inputFrame, text="Date Range:").grid(row=2, column=2, padx=5, pady=5)
+        dateRangeFrame = ttk.Frame(inputFrame)
+        dateRangeFrame.grid(row=2, column=3, padx=5, pady=5)
+        self.fromDateVar = tk.StringVar()
+        self.toDateVar = tk.StringVar()
+        ttk.Entry(dateRangeFrame, width=10, bootstyle='info', textvariable=self.fromDateVar).pack(side=tk.LEFT)
+        ttk.Label(dateRangeFrame, text=" - ").pack(side=tk.LEFT)
+        ttk.Entry(dateRangeFrame, width=10, bootstyle='info', textvariable=self.toDateVar).pack(side=tk.LEFT)
+
+        ttk.Label(inputFrame, text="Amount Range:").grid(row=3, column=2, padx=5, pady=5)
+        amountRangeFrame = ttk.Frame(inputFrame)
+        amountRangeFrame.grid(row=3, column=3, padx=5, pady=5)
+        self.minAmountVar = tk.StringVar()
+        self.maxAmountVar = tk.StringVar()
+        ttk.Entry(amountRangeFrame, width=10, bootstyle='info', textvariable=self.minAmountVar).pack(side=tk.LEFT)
+        ttk.Label(amountRangeFrame, text=" - ").pack(side=tk.LEFT)
+        ttk.Entry(amountRangeFrame, width=10, bootstyle='info', textvariable=self.maxAmountVar).pack(side=tk.LEFT)
+
+        # Description search, run once typing pauses
+        ttk.Label(inputFrame, text="Search Description:").grid(row=4, column=2, padx=5, pady=5)
+        self.searchVar = tk.StringVar()
+        ttk.Entry(inputFrame, width=24, bootstyle='info', textvariable=self.searchVar).grid(row=4, column=3, padx=5, pady=5)
+        self.searchVar.trace_add('write', self._schedule_search)
+
         # Button to add an expense entry
         add_Button = ttk.Button(inputFrame, text='Add Expense', bootstyle='success', command = self.add_Expenses)
-        add_Button.grid(row=3, column=1, columnspan=2, pady=10)
+        add_Button.grid(row=3, column=0, columnspan=2, pady=10)
 
-        # Call filter_Expenses function when filterVar is updated
-        self.filterVar.trace_add('write', self.filter_Expenses)
+        # Call filter_Expenses function when any filter is updated
+        for variable in (self.filterVar, self.fromDateVar, self.toDateVar, self.minAmountVar, self.maxAmountVar):
+            variable.trace_add('write', self.filter_Expenses)
 
-        # Treeview for displaying expense entries
-        self.tree = ttk.Treeview(self.root, columns=("Date", "Amount", "Category", "Description"), bootstyle='info', show="headings")
-        self.tree.heading("Date", text="Date")
-        self.tree.heading("Amount", text="Amount")
-        self.tree.heading("Category", text="Category")
-        self.tree.heading("Description", text="Description")
+        # Treeview for displaying expense entries, only the rows in view are materialised
+        # Clicking a heading sorts by that column, clicking it again reverses the order
+        self.sort_column = 'Date'
+        self.sort_reverse = False
+        self.table = VirtualTreeview(self.current_frame, ExpenseStore.SORT_COLUMNS, self._row_values,
+                                     on_heading=self.sort_Expenses, bootstyle='info')
+        self.tree = self.table.tree
+        self._update_headings()
 
         self.tree.column("Date", anchor="center", width=120)
         self.tree.column("Amount", anchor="center", width=120)
         self.tree.column("Category", anchor="center", width=120)
         self.tree.column("Description", anchor="center", width=200)
 
-        self.tree.pack(padx=10, pady=10, expand=True, fill='both')
+        self.table.pack(padx=10, pady=10, expand=True, fill='both')
+
+        # Total of the expenses matching the current filter
+        self.totalLabel = ttk.Label(self.current_frame, text="Total: $0.00", bootstyle='info')
+        self.totalLabel.pack(padx=10, anchor='e')
 
         # Button frame for control buttons
-        buttonFrame = ttk.Frame(self.root)
+        buttonFrame = ttk.Frame(self.current_frame)
         buttonFrame.pack(padx=10, pady=10)
 
         visualiseButton = ttk.Button(buttonFrame, text='Visualise Expenses', bootstyle='info', command=self.visualise_Expenses)
@@ -224,29 +1958,117 @@ class ExpenseTracker(mainWindow):
         saveButton.pack(side=tk.LEFT, padx=10)
         loadButton = ttk.Button(buttonFrame, text='Load Expenses', bootstyle='info', command=self.load_Expenses)
         loadButton.pack(side=tk.LEFT, padx=10)
+        importButton = ttk.Button(buttonFrame, text='Import CSV', bootstyle='info-outline', command=self.import_Expenses)
+        importButton.pack(side=tk.LEFT, padx=10)
+        exportButton = ttk.Button(buttonFrame, text='Export CSV', bootstyle='info-outline', command=self.export_Expenses)
+        exportButton.pack(side=tk.LEFT, padx=10)
         deleteButton = ttk.Button(buttonFrame, text='Delete Expenses', bootstyle='danger', command=self.delete_Expenses)
         deleteButton.pack(side=tk.LEFT, padx=10)
         closeButton = ttk.Button(buttonFrame, text="Close", command=self.return_to_main_menu)  
         closeButton.pack(side=tk.LEFT, padx=10)
 
-    # Return to Main Menu
+        # Progress of a running load, only shown while loading
+        self.progressFrame = ttk.Frame(self.current_frame)
+        self.progressBar = ttk.Progressbar(self.progressFrame, bootstyle='info', maximum=1.0, length=400)
+        self.progressBar.pack(side=tk.LEFT, padx=10)
+        ttk.Button(self.progressFrame, text='Cancel Load', bootstyle='danger', command=self.cancel_load).pack(side=tk.LEFT, padx=10)
+
+    # Return to Main Menu, keeping the ledger and view as they are
     def return_to_main_menu(self):
-        
-        self.mainApp.clear_frame()
         self.mainApp.menuGUI()
+
+    def on_show(self):
+        self.root.title(self.window_title)
+        self.style.configure('.', font=("Helvetica", 12))
     
-    # Private method to add expense
+    # DataFrame of the ledger in date order, built from the store on demand
+    @property
+    def expense_df(self):
+        return self.store.to_dataframe()
+
+    # Values displayed in the Treeview for a single expense
+    def _row_values(self, row_ids):
+        return self.store.display_rows(row_ids)
+
+    # Private method to add expense, returns the row id of the new expense
     def _add_expense_internal(self, amount, category, description, date):
-        new_Expense = pd.DataFrame({
-                "Date": [date],
-                "Amount": [amount],
-                "Category": [category],
-                "Description": [description]
-            })
-        
-        #Add new expense to current expense dataframe
-        self.expense_df = pd.concat([self.expense_df, new_Expense], ignore_index=True)
-        self.expense_df = self.expense_df.sort_values('Date')
+        row_id = self.store.append(date, amount, category, description)
+        self.journal.record_add(row_id, *self.store.raw_row(row_id))
+        return row_id
+
+    # Refuse edits, saves and exports until the saved ledger is in memory
+    def _check_loaded(self):
+        if not self.loaded:
+            messagebox.showerror(title='Error', message='The saved expenses are still loading.')
+        return self.loaded
+
+    # Collect the filter widgets into ExpenseStore.query arguments, ignoring incomplete values;
+    # with `strict`, a NaN or infinite amount bound raises ValueError instead of being ignored
+    def _current_filter(self, strict=False):
+        selected_category = self.filterVar.get()
+        filters = {'category': None if selected_category == 'All' else selected_category}
+
+        for key, variable in (('start', self.fromDateVar), ('end', self.toDateVar)):
+            text = variable.get().strip()
+            try:
+                filters[key] = pd.to_datetime(text, format='%Y-%m-%d') if text else None
+            except ValueError:
+                filters[key] = None
+
+        for key, label, variable in (('min_amount', 'minimum', self.minAmountVar), ('max_amount', 'maximum', self.maxAmountVar)):
+            try:
+                value = float(variable.get())
+            except ValueError:
+                value = None
+            if value is not None and not math.isfinite(value):
+                if strict:
+                    raise ValueError(f"The {label} amount must be a finite number")
+                value = None
+            filters[key] = value
+
+        filters['text'] = self.searchVar.get().strip() or None
+        return filters
+
+    # Insert a single expense into the view at its place in the current sort, if it passes the filter
+    def _show_expense(self, row_id):
+        if not self.store.matches(row_id, **self._current_filter()):
+            return
+
+        key = self.store.sort_key(self.sort_column)
+        rows = self.table.rows
+        if self.sort_reverse:
+            # Descending rows: find the first one that sorts below the new expense
+            target = key(row_id)
+            index = bisect.bisect_left(range(len(rows)), True, key=lambda index: key(rows[index]) < target)
+        else:
+            index = bisect.bisect_left(rows, key(row_id), key=key)
+        self.table.insert_row(index, row_id)
+
+    # Mark the sorted column's heading with the sort direction
+    def _update_headings(self):
+        for column in ExpenseStore.SORT_COLUMNS:
+            arrow = (' \u25bc' if self.sort_reverse else ' \u25b2') if column == self.sort_column else ''
+            self.tree.heading(column, text=column + arrow)
+
+    def sort_Expenses(self, column):
+        """
+        Sort the view by a column, reversing the order if it is already sorted by it.
+
+        - The order is read from the store's maintained sort indexes, so nothing is re-sorted.
+        - Only the rows in view are redrawn.
+        """
+        if column == self.sort_column:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column, self.sort_reverse = column, False
+        self._update_headings()
+        self.table.set_rows(self._sorted_rows(self._current_filter()))
+
+    # Row ids matching the filters, in the current sort order
+    def _sorted_rows(self, filters):
+        filtered = any(value is not None for value in filters.values())
+        row_ids = self.store.query(**filters) if filtered else None
+        return self.store.sorted_rows(self.sort_column, self.sort_reverse, row_ids)
 
     def add_Expenses(self):
         """
@@ -257,6 +2079,8 @@ class ExpenseTracker(mainWindow):
         - Appends the new entry to the DataFrame and updates the GUI.
         - Raises a ValueError for invalid inputs.
         """
+        if not self._check_loaded():
+            return
         try:    
             # Retrieve input values
             amount = self.amountEntry.get()
@@ -274,18 +2098,12 @@ class ExpenseTracker(mainWindow):
             # Convert amount to float and add inputs to Dataframe 
             amount = float(amount)
             display_date = pd.to_datetime(date, dayfirst=True)
-            self._add_expense_internal(amount, category, description, display_date)
-            
-            #Clear the treeview
-            for record in self.tree.get_children():
-                self.tree.delete(record)
-
-            #insert data into Treeview
-            for index,row in self.expense_df.iterrows():
-                self.tree.insert(parent='', index='end', values=(row['Date'].strftime('%Y-%m-%d'), 
-                                                                 f"${row['Amount']}", 
-                                                                 row['Category'], 
-                                                                 row['Description']))
+            row_id = self._add_expense_internal(amount, category, description, display_date)
+
+            #Insert only the new row into the Treeview
+            self._show_expense(row_id)
+            self._update_total()
+            self._refresh_chart()
             
             #Reset input fields
             self.amountEntry.delete(0, tk.END)
@@ -296,49 +2114,60 @@ class ExpenseTracker(mainWindow):
             messagebox.showerror(title='Input Error', message=f'{str(e)}')
 
     def filter_Expenses(self, *args):
-        selected_category = self.filterVar.get()
-
-        for record in self.tree.get_children():
-            self.tree.delete(record)
+        """
+        Show the expenses matching the category, date range, amount range and description search.
 
-        if selected_category == 'All':
-            filter_df = self.expense_df
+        - The matching rows come from the store's sorted indexes, not from a scan of the ledger,
+          and are shown in the current sort order.
+        - Only the rows in view are redrawn.
+        """
+        if self.search_job is not None:
+            self.root.after_cancel(self.search_job)
+            self.search_job = None
+        try:
+            filters = self._current_filter(strict=True)
+        except ValueError as e:
+            messagebox.showerror(title='Input Error', message=f'{str(e)}')
+            return
+        self.table.set_rows(self._sorted_rows(filters))
+        self._update_total(filters)
+        self._refresh_chart()
+
+    # Filter once the user stops typing in the search box, instead of on every keystroke
+    def _schedule_search(self, *args):
+        if self.search_job is not None:
+            self.root.after_cancel(self.search_job)
+        self.search_job = self.root.after(self.SEARCH_DELAY_MS, self.filter_Expenses)
+
+    # Show the total of the filtered expenses, from the rollup unless an amount range or search is set
+    def _update_total(self, filters=None):
+        filters = filters or self._current_filter()
+        if filters['min_amount'] is None and filters['max_amount'] is None and filters['text'] is None:
+            total = self.store.spend(filters['category'], filters['start'], filters['end'])
         else:
-            filter_df = self.expense_df[self.expense_df['Category'] == selected_category]
+            total = self.store.total(self.table.rows)
+        self.totalLabel.config(text=f"Total: {format_cents([round(total * 100)])[0]}")
 
-        for index,row in filter_df.iterrows():
-            self.tree.insert(parent='', index='end', values=(row['Date'].strftime('%Y-%m-%d'), 
-                                                                 f"${row['Amount']}", 
-                                                                 row['Category'], 
-                                                                 row['Description'])
-                                                                 )
+    def cancel_filter(self):
+        for variable in (self.fromDateVar, self.toDateVar, self.minAmountVar, self.maxAmountVar, self.searchVar):
+            variable.set('')
+        self.filterCombo.set('All')
 
 
     def delete_Expenses(self):
-        selected = self.tree.selection()
+        if not self._check_loaded():
+            return
+        selected = self.table.selection()
         if selected:
             confirm = messagebox.askyesno(title="Delete Confirmation", message="Are you sure you want to delete the selected Expense(s)?")
             if confirm:
-                for item in selected:
-                    # Get the values from the treeview
-                    values = self.tree.item(item)['values']  
-                    # Convert values to match DataFrame format for comparison
-                    date = pd.to_datetime(values[0])
-                    amount = float(values[1].replace('$', ''))
-                    category = values[2]
-                    description = values[3]
-
-                    # Find and remove matching row from DataFrame
-                    mask = ((self.expense_df['Date'] == date) & \
-                            (self.expense_df['Amount'] == amount) & \
-                            (self.expense_df['Category'] == category) & \
-                            (self.expense_df['Description'] == description))
-                    self.expense_df = self.expense_df[~mask]
-
-                    # Remove selected item from treeview
-                    self.tree.delete(item)
-
-                self.expense_df.reset_index(drop=True, inplace=True)  # Reset the DataFrame index
+                # Remove only the selected rows, looked up by their row id
+                deleted = self.store.delete(selected)
+                self.journal.record_delete(deleted)
+                self.table.delete_rows(deleted)
+                self._update_total()
+                self._refresh_chart()
+
                 messagebox.showinfo("Success", "Selected Expense(s) deleted successfully!")
         else:
             messagebox.showwarning("Selection Error", "Please select a expense to delete.")
@@ -347,97 +2176,363 @@ class ExpenseTracker(mainWindow):
         """
         Visualize expenses using a pie chart.
 
-        - Groups expenses by category and calculates the total amount for each category.
-        - Uses matplotlib to display a pie chart with percentages and a title.
+        - Uses the store's running category totals instead of grouping the ledger.
+        - Draws into a matplotlib Figure embedded in a chart window that is built once and reused.
+        - Only redraws when the ledger changed since the last draw.
         """
         
         #Check existence of any category
-        if self.expense_df.empty:
+        if len(self.store) == 0:
             messagebox.showerror(title='Visualisation Error', message=f'Unable to visualise expenses.')
             return
-        
-        #Set visual style 
-        plt.style.use("fivethirtyeight")
-
-        #Group expenses by category and calculate the total amount
-        totalCategory = self.expense_df.groupby('Category')['Amount'].sum()
-        
-        #Create piechart with category totals
-        plt.pie(totalCategory.values, labels=totalCategory.index, 
-                autopct='%1.1f%%', shadow=True, 
-                wedgeprops={'edgecolor': 'black'})
-        
-        #Set piechart title
-        plt.title('Expenses by Category')
 
-        #Ensure piechart has equal aspect ratio
-        plt.axis()
-        
-        #Adjust layout and display chart
-        plt.tight_layout()
-        plt.legend(title='Category:')
-        plt.show()
+        if self.chart_window is None or not self.chart_window.winfo_exists():
+            self._build_chart_window()
+        self.chart_window.deiconify()
+        self._refresh_chart()
+        self.chart_window.lift()
+
+    def _build_chart_window(self):
+        self.chart_window = tk.Toplevel(self.root)
+        self.chart_window.title('Expenses by Category')
+        # Closing only hides the window so the canvas can be reused
+        self.chart_window.protocol('WM_DELETE_WINDOW', self.chart_window.withdraw)
+
+        # Resolution of the spend trend next to the pie
+        controlFrame = ttk.Frame(self.chart_window)
+        controlFrame.pack(padx=10, pady=5, fill='x')
+        ttk.Label(controlFrame, text="Trend Resolution:").pack(side=tk.LEFT, padx=5)
+        self.resolutionVar = tk.StringVar(value='Monthly')
+        resolutionCombo = ttk.Combobox(controlFrame, bootstyle='info', textvariable=self.resolutionVar,
+                                       values=ExpenseRollup.RESOLUTIONS, state='readonly')
+        resolutionCombo.pack(side=tk.LEFT, padx=5)
+        self.resolutionVar.trace_add('write', lambda *args: self._refresh_chart(force=True))
+
+        with mpl_style.context("fivethirtyeight"):
+            self.chart_figure = mpl_figure.Figure(figsize=(12, 6))
+            self.chart_axes = self.chart_figure.add_subplot(1, 2, 1)
+            self.trend_axes = self.chart_figure.add_subplot(1, 2, 2)
+        self.chart_canvas = mpl_backend.FigureCanvasTkAgg(self.chart_figure, master=self.chart_window)
+        self.chart_canvas.get_tk_widget().pack(fill='both', expand=True)
+        self.chart_version = None
+
+    # Redraw the charts if they are shown and the ledger changed since they were drawn;
+    # a closed chart is only withdrawn and catches up when visualise_Expenses shows it again
+    def _refresh_chart(self, force=False):
+        if self.chart_window is None or not self.chart_window.winfo_exists():
+            return
+        if self.chart_window.state() == 'withdrawn':
+            return
+        if self.chart_version == self.store.version and not force:
+            return
 
-    #Save expenses to csv file
+        totals = self.store.category_totals()
+        resolution = self.resolutionVar.get()
+        self.chart_axes.clear()
+        self.trend_axes.clear()
+        with mpl_style.context("fivethirtyeight"):
+            if totals:
+                #Create piechart with category totals
+                self.chart_axes.pie(list(totals.values()), labels=list(totals),
+                                    autopct='%1.1f%%', shadow=True,
+                                    wedgeprops={'edgecolor': 'black'})
+                self.chart_axes.legend(title='Category:')
+
+                #Spend per category over time, from the day-bucket rollup
+                for category in totals:
+                    series = self.store.spend_series(category, resolution)
+                    self.trend_axes.plot(series.index, series.values, label=category)
+                self.trend_axes.legend(title='Category:')
+                self.chart_figure.autofmt_xdate()
+
+            #Set piechart title and ensure piechart has equal aspect ratio
+            self.chart_axes.set_title('Expenses by Category')
+            self.chart_axes.axis('equal')
+            self.trend_axes.set_title(f'{resolution} Spend')
+            self.chart_figure.tight_layout()
+        self.chart_canvas.draw_idle()
+        self.chart_version = self.store.version
+
+    #Save the changes made since the last save
     def save_Expenses(self):    
-        try:
-            file_name = f"expense_data/expenses.csv"
-            answer = messagebox.askokcancel(title='Save Confirmation', message='Confirm to save?')
+        """
+        Save expenses by writing the changes since the last save to the database.
 
-            if answer == True:
-                self.expense_df.to_csv(file_name, index=False)
-                messagebox.showinfo(title='File saved', message='File saved successfully.')
+        - Inserts and deletes only the changed rows in one transaction, so it costs O(changes)
+          instead of rewriting the whole ledger.
+        - Rewrites the whole expenses table instead after an import replaced the ledger.
+        - The writing happens on the I/O executor in the expenses lane; saves queued behind
+          a running one are merged into a single write.
+        """
+        if not self._check_loaded():
+            return
+        answer = messagebox.askokcancel(title='Save Confirmation', message='Confirm to save?')
+        if answer != True:
+            return
 
+        self._submit_save(self._finish_save, self._fail_save)
+
+    def save_on_exit(self):
+        """Offer to save the changes made since the last save before the application closes."""
+        if not self.loaded or not (self.snapshot_required or self.journal.pending):
+            return
+        if messagebox.askyesno(title='Unsaved Changes', message='Save your expense changes before exiting?'):
+            self._submit_save(None, lambda e: print(f"Could not save expenses: {e}"))
+
+    # Queue the write in the expenses lane: a snapshot after an import, otherwise the journal
+    def _submit_save(self, on_done, on_error):
+        if self.snapshot_required:
+            self.snapshot_required = False
+            self.io.submit(self._write_snapshot, self._snapshot_columns(), lane='expenses', merge='snapshot',
+                           on_done=on_done, on_error=lambda e: self._fail_snapshot(e, on_error))
+        else:
+            self.io.submit(self.journal.flush, self.journal.seq, lane='expenses', merge='journal',
+                           on_done=on_done, on_error=on_error)
+
+    def _finish_save(self, written):
+        messagebox.showinfo(title='File saved', message='File saved successfully.')
+
+    def _fail_save(self, error):
+        messagebox.showerror(title='Save Error', message=f'Unable to save the file: {str(error)}')
+
+    # The journal was discarded for the snapshot, so only another snapshot can save the ledger now
+    def _fail_snapshot(self, error, on_error):
+        self.snapshot_required = True
+        on_error(error)
+
+    # Columns of the current ledger; the snapshot includes every change journaled so far
+    def _snapshot_columns(self):
+        self.journal.discard_pending()
+        return self.store.columns()
+
+    # Runs in the expenses lane, so an older snapshot can never land after a newer one
+    def _write_snapshot(self, columns):
+        self.storage.save(columns)
+
+    # Runs in the expenses lane: read the saved ledger from the expenses table
+    def _read_saved_store(self):
+        if not self.storage.exists():
+            return None
+        return ExpenseStore.from_columns(**self.storage.load())
+
+    # Swap in a ledger read by `_read_saved_store`, dropping changes made to the old one
+    def _use_saved_store(self, store):
+        self.store = store
+        self.journal.discard_pending()
+        self.snapshot_required = False
+        self.loaded = True
+        self.filter_Expenses()
+        self._index_descriptions()
+
+    # Build the description search index on a worker from a snapshot of the ledger
+    def _index_descriptions(self):
+        store, version = self.store, self.store.version
+
+        def built(terms):
+            # Rebuild from a fresh snapshot if expenses were added or deleted meanwhile
+            if not store.install_search_index(terms, version) and store is self.store:
+                self._index_descriptions()
+
+        self.io.submit(ExpenseStore.build_search_index, *store.search_snapshot(),
+                       lane='expenses-search', merge='index', on_done=built)
+
+    # Open the saved ledger in the background when the tracker starts
+    def open_saved_Expenses(self):
+        def opened(saved):
+            if saved is not None:
+                self._use_saved_store(saved)
             else:
-                return
-        except Exception as e:
-            messagebox.showerror(title='Save Error', message=f'Unable to save the file: {str(e)}')
+                self.loaded = True
 
-    #Load expenses from CSV file
+        self.io.submit(self._read_saved_store, lane='expenses', on_done=opened,
+                       on_error=lambda e: messagebox.showerror(title='Load Error', message=f'Unable to load the saved expenses: {str(e)}'))
+
+    #Load the saved expenses
     def load_Expenses(self):
         """
-        Load expenses from an external CSV file into the tracker.
+        Reload the saved expenses, discarding unsaved changes.
 
-        - Prompts the user for a file name using a dialog box.
-        - Reads the specified CSV file and parses its contents into a DataFrame.
-        - Updates the treeview widget with the loaded expense entries.
-        - Validates that the file exists and handles errors gracefully.
-        - Raises a Load Error for invalid file name.
+        - Asks for confirmation before replacing the current expenses.
+        - Reads the expenses table on the I/O executor.
+        - Falls back to importing the CSV file when nothing has been saved yet.
+        - Handles errors gracefully with a Load Error message.
         """
-        
-        try:
+        answer = messagebox.askokcancel(title='Load Confirmation', message='Confirm to load?')
+        if answer != True:
+            return
 
-            answer = messagebox.askokcancel(title='Load Confirmation', message='Confirm to load?')
-            if answer == True:
-                #the file name of the CSV file
-                file_path = f"expense_data/expenses.csv" 
+        def loaded(saved):
+            if saved is None:
+                self.loaded = True
+                self._start_import(self.csv_path)
+                return
+            #Redraw the view from the first rows of the loaded expenses
+            self._use_saved_store(saved)
+            messagebox.showinfo(title='Expenses loaded', message=f'Expenses from {self.storage.path} loaded successfully.')
 
-            
-                # Load the file into a DataFrame, ensuring the 'Date' column is parsed correctly
-                loaded_file = pd.read_csv(file_path, parse_dates= ['Date'])
-                
-            
-                #Update expenses Dataframe
-                self.expense_df = loaded_file
+        self.io.submit(self._read_saved_store, lane='expenses', on_done=loaded,
+                       on_error=lambda e: messagebox.showerror(title='Load Error', message=f'Unable to load the file: {str(e)}'))
 
-                
-                #Delete old records
-                for record in self.tree.get_children():
-                    self.tree.delete(record)
-
-                #Update Treeview from expenses Dataframe
-                for index, row in self.expense_df.iterrows():
-                    dollar_amount = f"${row['Amount']}"
-                    self.tree.insert(parent='', index='end', values=(row['Date'].strftime('%Y-%m-%d'), 
-                                                                    dollar_amount, 
-                                                                    row['Category'],
-                                                                    row['Description']))
-                    
-                messagebox.showinfo(title='Expenses loaded', message=f'Expenses from {file_path} loaded successfully.')
-            else:
-                return
+    #Export expenses to CSV file
+    def export_Expenses(self):
+        if not self._check_loaded():
+            return
+        try:
+            answer = messagebox.askokcancel(title='Export Confirmation', message=f'Export expenses to {self.csv_path}?')
+            if answer == True:
+                # The frame is built on the Tk thread; only writing the file happens in the background
+                frame = self.expense_df
+                self.io.submit(lambda: frame.to_csv(self.csv_path, index=False, date_format=self.CSV_DATE_FORMAT),
+                               lane='expenses-export',
+                               on_done=lambda _: messagebox.showinfo(title='File exported', message='File exported successfully.'),
+                               on_error=lambda e: messagebox.showerror(title='Export Error', message=f'Unable to export the file: {str(e)}'))
         except Exception as e:
-            messagebox.showerror(title='Load Error', message=f'Unable to load the file: {str(e)}')
+            messagebox.showerror(title='Export Error', message=f'Unable to export the file: {str(e)}')
+
+    #Import expenses from CSV file
+    def import_Expenses(self):
+        """
+        Import expenses from the CSV file into the tracker.
+
+        - Asks for confirmation, then streams the file in chunks on a worker thread.
+        - Chunks are appended to a new store, so the current ledger stays intact until the import completes.
+        - Shows a progress bar with a cancel button while importing.
+        - Validates that the file exists and handles errors gracefully.
+        """
+        if not self._check_loaded():
+            return
+        answer = messagebox.askokcancel(title='Import Confirmation', message='Confirm to import?')
+        if answer == True:
+            self._start_import(self.csv_path)
+
+    def _start_import(self, file_path):
+        if not os.path.exists(file_path):
+            messagebox.showerror(title='Load Error', message=f'Unable to load the file: {file_path} does not exist.')
+            return
+
+        if self.loader is not None:
+            self.loader.cancel()
+
+        loading_store = ExpenseStore(self.categories)
+        self.loader = ChunkedCSVLoader(
+            self.root, file_path,
+            on_chunk=lambda chunk: loading_store.extend(chunk, reindex=False),
+            on_progress=lambda fraction: self.progressBar.configure(value=fraction),
+            on_done=lambda: self._finish_load(loading_store, file_path),
+            on_error=self._fail_load,
+            prepare=self._prepare_chunk,
+            usecols=list(self.CSV_DTYPES),
+            dtype=self.CSV_DTYPES,
+        )
+        self.progressBar.configure(value=0)
+        self.progressFrame.pack(padx=10, pady=5)
+        self.loader.start()
+
+    # Runs on the loader thread: parse dates with the known format instead of inferring it,
+    # and reject rows without a date or amount, which the store cannot represent
+    def _prepare_chunk(self, chunk):
+        chunk['Date'] = pd.to_datetime(chunk['Date'], format=self.CSV_DATE_FORMAT)
+        missing = (chunk['Date'].isna() | chunk['Amount'].isna()).to_numpy()
+        if missing.any():
+            # The chunk index counts data rows across chunks; the file adds a header line
+            line = int(chunk.index[missing][0]) + 2
+            raise ValueError(f"line {line} of the file has no Date or Amount")
+        return chunk
+
+    def _finish_load(self, loading_store, file_path):
+        loading_store.reindex()
+        self.store = loading_store
+        # The journal cannot express a replaced ledger, so the next save writes a full snapshot
+        self.journal.discard_pending()
+        self.snapshot_required = True
+        self.loader = None
+        self.progressFrame.pack_forget()
+
+        #Redraw the view from the first rows of the loaded expenses
+        self.filter_Expenses()
+        self._index_descriptions()
+        messagebox.showinfo(title='Expenses loaded', message=f'Expenses from {file_path} loaded successfully.')
+
+    def _fail_load(self, error):
+        self.loader = None
+        self.progressFrame.pack_forget()
+        messagebox.showerror(title='Load Error', message=f'Unable to load the file: {str(error)}')
+
+    def cancel_load(self):
+        if self.loader is not None:
+            self.loader.cancel()
+            self.loader = None
+        self.progressFrame.pack_forget()
+
+
+class DeckStore:
+    """
+    Flashcards partitioned into decks in the database, with a manifest of the decks.
+
+    - The `decks` table is the manifest: each deck's name and card count, kept up to date in the
+      same transaction as the cards, so listing decks never reads a card.
+    - Cards are keyed by (deck, question); a deck's cards are read only when it is opened.
+    - Adding cards inserts just the new rows.
+    - The cards of the old single-deck table, or of flashcards.json before that, are moved
+      into a "Default" deck the first time the manifest is read.
+    - Every method does database work, so the app calls them on the I/O executor.
+    """
+    DEFAULT_DECK = "Default"
+
+    def __init__(self, database, legacy_file="flashcards.json"):
+
+        self.database = database
+        self.legacy_file = legacy_file
+
+    def decks(self):
+        """Return the manifest as (id, name, card count) rows in creation order."""
+        rows = self.database.query("SELECT id, name, cards FROM decks ORDER BY id")
+        if not rows:
+            self.create_deck(self.DEFAULT_DECK, self._legacy_cards())
+            rows = self.database.query("SELECT id, name, cards FROM decks ORDER BY id")
+        return rows
+
+    def create_deck(self, name, cards=()):
+        """Create a deck, optionally with (question, answer) cards, and return its manifest row."""
+        with self.database.transaction() as connection:
+            deck_id = connection.execute("INSERT INTO decks (name) VALUES (?)", (name,)).lastrowid
+            count = self._insert(connection, deck_id, cards)
+        return (deck_id, name, count)
+
+    def load(self, deck_id):
+        """Return the cards of one deck as a question -> answer dict in the order they were added."""
+        return dict(self.database.query("SELECT question, answer FROM deck_cards WHERE deck = ? ORDER BY rowid",
+                                        (deck_id,)))
+
+    def add(self, deck_id, cards):
+        """Append (question, answer) cards to a deck, skipping questions it already has; return the number added."""
+        with self.database.transaction() as connection:
+            return self._insert(connection, deck_id, cards)
+
+    def clear(self, deck_id):
+        """Delete every card of a deck, keeping the deck itself."""
+        with self.database.transaction() as connection:
+            connection.execute("DELETE FROM deck_cards WHERE deck = ?", (deck_id,))
+            connection.execute("UPDATE decks SET cards = 0 WHERE id = ?", (deck_id,))
+
+    def _insert(self, connection, deck_id, cards):
+        before = connection.total_changes
+        connection.executemany("INSERT OR IGNORE INTO deck_cards (deck, question, answer) VALUES (?, ?, ?)",
+                               [(deck_id, question, answer) for question, answer in cards])
+        added = connection.total_changes - before
+        if added:
+            connection.execute("UPDATE decks SET cards = cards + ? WHERE id = ?", (added, deck_id))
+        return added
+
+    def _legacy_cards(self):
+        cards = self.database.query("SELECT question, answer FROM flashcards ORDER BY rowid")
+        if not cards and os.path.exists(self.legacy_file):
+            try:
+                with open(self.legacy_file, "r") as file:
+                    cards = list(json.load(file).items())
+            except json.JSONDecodeError:
+                cards = []
+        return cards
 
 
 class FlashcardBase(mainWindow):
@@ -465,6 +2560,7 @@ class FlashcardApp(FlashcardBase):
     GUI-based flashcard application.
     Responsibilities:
     - Allows users to create, view ,save, and load flashcards.
+    - Organises flashcards in decks; only the open deck's cards are held in memory.
     - Implements a structured GUI for input and visualization.
     - Ensures proper file handling and data validation.
     """
@@ -473,10 +2569,19 @@ class FlashcardApp(FlashcardBase):
         super().__init__()
         self.root = root_window
         self.mainApp = mainApp
-        self.root.title(title)
+        self.database = mainApp.database
+        self.io = mainApp.io
+        self.window_title = title
         self.current_frame = ttk.Frame(self.root)
-        self.current_frame.pack(fill='both')
-        self.flashcards = self.load_flashcard()
+        self.flashcards = {}
+        # Deck manifest, name -> (deck id, card count), and the deck whose cards are loaded
+        self.deck_store = DeckStore(self.database, self.FLASHCARD_FILE)
+        self.decks = {}
+        self.deck_id = None
+        self.deck_name = None
+        self.deck_var = tk.StringVar()
+        self.io.submit(self.deck_store.decks, lane='flashcards', on_done=self._use_manifest,
+                       on_error=lambda e: messagebox.showerror("Error", f"Could not load flashcard decks: {e}"))
         
         self.correct_answers = 0  # Tracks correct answers during quizzes
         
@@ -484,69 +2589,147 @@ class FlashcardApp(FlashcardBase):
 
 
     def return_to_main_menu(self):
-        self.clear_frame()
         self.mainApp.menuGUI()
 
+    def on_show(self):
+        self.root.title(self.window_title)
+
 
     def GUI_menu(self):
         """Display the main menu."""
         self.clear_frame()
-        tk.Label(self.root, text="Flashcard App", font=("Arial", 50)).pack(pady=50)
-        tk.Button(self.root, text="Create Flashcards", font=("Arial", 18), command=self.create_flashcards, padx=9, pady=10).pack(pady=5)
-        tk.Button(self.root, text="View Flashcards", font=("Arial", 18), command=self.view_flashcards, padx=23, pady=10).pack(pady=5)
-        tk.Button(self.root, text="Quiz Yourself", font=("Arial", 18), command=self.quiz_flashcards, padx=49, pady=10).pack(pady=5)
-        tk.Button(self.root, text="Reset Flashcards", font=("Arial", 18), command=self.reset_all_flashcards, padx=17, pady=10).pack(pady=5)
-        tk.Button(self.root, text="Exit", font=("Arial", 16), command=self.return_to_main_menu, padx=25, pady=10).pack(pady=5)
+        tk.Label(self.current_frame, text="Flashcard App", font=("Arial", 50)).pack(pady=(50, 20))
+
+        # Deck picker and creation
+        deck_frame = tk.Frame(self.current_frame)
+        deck_frame.pack(pady=(0, 20))
+        tk.Label(deck_frame, text="Deck:", font=("Arial", 16)).pack(side="left", padx=5)
+        self.deck_combo = ttk.Combobox(deck_frame, textvariable=self.deck_var, values=list(self.decks), state='readonly')
+        self.deck_combo.pack(side="left", padx=5)
+        self.deck_combo.bind('<<ComboboxSelected>>', lambda event: self.open_deck(self.deck_var.get()))
+        self.new_deck_entry = tk.Entry(deck_frame, width=20)
+        self.new_deck_entry.pack(side="left", padx=5)
+        tk.Button(deck_frame, text="New Deck", font=("Arial", 14), command=self.create_deck).pack(side="left", padx=5)
+        self.deck_info = tk.Label(self.current_frame, font=("Arial", 14), fg="gray")
+        self.deck_info.pack(pady=(0, 20))
+        self._refresh_deck_picker()
+        tk.Button(self.current_frame, text="Create Flashcards", font=("Arial", 18), command=self.create_flashcards, padx=9, pady=10).pack(pady=5)
+        tk.Button(self.current_frame, text="View Flashcards", font=("Arial", 18), command=self.view_flashcards, padx=23, pady=10).pack(pady=5)
+        tk.Button(self.current_frame, text="Quiz Yourself", font=("Arial", 18), command=self.quiz_flashcards, padx=49, pady=10).pack(pady=5)
+        tk.Button(self.current_frame, text="Reset Flashcards", font=("Arial", 18), command=self.reset_all_flashcards, padx=17, pady=10).pack(pady=5)
+        tk.Button(self.current_frame, text="Exit", font=("Arial", 16), command=self.return_to_main_menu, padx=25, pady=10).pack(pady=5)
 
 
     def create_flashcards(self):
         """Allows the user to create flashcards."""
         self.clear_frame()
-        tk.Label(self.root, text="Create a Flashcard", font=("Arial", 18), padx=20, pady=10).pack(pady=10)
+        tk.Label(self.current_frame, text="Create a Flashcard", font=("Arial", 18), padx=20, pady=10).pack(pady=10)
 
-        tk.Label(self.root, text="Question:", font=("Arial", 16)).pack()
-        self.question_entry = tk.Entry(self.root, width=50)
+        tk.Label(self.current_frame, text="Question:", font=("Arial", 16)).pack()
+        self.question_entry = tk.Entry(self.current_frame, width=50)
         self.question_entry.pack(pady=5)
 
-        tk.Label(self.root, text="Answer:", font=("Arial", 16)).pack()
-        self.answer_entry = tk.Entry(self.root, width=50) 
+        tk.Label(self.current_frame, text="Answer:", font=("Arial", 16)).pack()
+        self.answer_entry = tk.Entry(self.current_frame, width=50) 
         self.answer_entry.pack(pady=5)
 
-        tk.Button(self.root, text="Add Flashcard", font=("Arial", 15), command=self.process_add_flashcard).pack(pady=5)
-        tk.Button(self.root, text="Back to Menu", font=("Arial", 15), command=self.GUI_menu).pack(pady=5)
+        tk.Button(self.current_frame, text="Add Flashcard", font=("Arial", 15), command=self.process_add_flashcard).pack(pady=5)
+        tk.Button(self.current_frame, text="Back to Menu", font=("Arial", 15), command=self.GUI_menu).pack(pady=5)
 
     def reset_all_flashcards(self):
-        if messagebox.askyesno("Confirm Deletion", "Are you sure you want to delete all flashcards?"):
-        # Reset the flashcards in memory and in the file
+        if self.deck_id is None:
+            messagebox.showerror("Error", "The flashcard decks are still loading.")
+            return
+        if messagebox.askyesno("Confirm Deletion", f"Are you sure you want to delete all flashcards in the '{self.deck_name}' deck?"):
+        # Reset the open deck in memory and in the database
             self.flashcards = {}
-            self.save_flashcards()  # Save the empty dictionary to the file
-            messagebox.showinfo("Deleted", "All flashcards have been deleted.")
+            self.decks[self.deck_name] = (self.deck_id, 0)
+            self.io.submit(self.deck_store.clear, self.deck_id, lane='flashcards',
+                           on_done=lambda _: messagebox.showinfo("Deleted", "All flashcards in the deck have been deleted."),
+                           on_error=lambda e: messagebox.showerror("Error", f"Could not delete flashcards: {e}"))
             self.GUI_menu()
 
-    def load_flashcard(self):
-        """Load flashcards from the file."""
-        try:
-            with open(self.FLASHCARD_FILE, "r") as file:
-                return json.load(file)
-        except FileNotFoundError:
-                return {}  # If the file doesn't exist, return an empty dictionary
-        except json.JSONDecodeError:
-                return {}
-
-    def save_flashcards(self):
-        """Save the current flashcards to a file."""
-        with open(self.FLASHCARD_FILE, "w") as file:
-            json.dump(self.flashcards, file)
+    # Take the deck manifest read at startup and open the first deck
+    def _use_manifest(self, rows):
+        self.decks = {name: (deck_id, cards) for deck_id, name, cards in rows}
+        self._refresh_deck_picker()
+        if self.deck_id is None and self.decks:
+            self.open_deck(next(iter(self.decks)))
+
+    # Update the deck picker and the open deck's card count from the manifest, if the menu is shown
+    def _refresh_deck_picker(self):
+        if self.deck_combo.winfo_exists():
+            self.deck_combo.configure(values=list(self.decks))
+            if self.deck_name in self.decks:
+                self.deck_info.config(text=f"{self.decks[self.deck_name][1]} cards")
+
+    def open_deck(self, name):
+        """Switch to a deck, dropping the previous deck's cards and loading this one's in the background."""
+        deck_id = self.decks[name][0]
+        if deck_id == self.deck_id:
+            return
+        self.deck_id = deck_id
+        self.deck_name = name
+        self.deck_var.set(name)
+        self.flashcards = {}
+        self._refresh_deck_picker()
+        self.io.submit(self.deck_store.load, deck_id, lane='flashcards',
+                       on_done=lambda flashcards: self._use_flashcards(deck_id, flashcards),
+                       on_error=lambda e: messagebox.showerror("Error", f"Could not load the deck: {e}"))
+
+    def create_deck(self):
+        """Create an empty deck named in the entry and open it."""
+        name = self.new_deck_entry.get().strip()
+        if not name:
+            messagebox.showerror("Error", "Please enter a deck name.")
+            return
+        if name in self.decks:
+            messagebox.showerror("Error", "A deck with this name already exists.")
+            return
+
+        def created(row):
+            deck_id, name, cards = row
+            self.decks[name] = (deck_id, cards)
+            self._refresh_deck_picker()
+            self.open_deck(name)
+
+        self.new_deck_entry.delete(0, tk.END)
+        self.io.submit(self.deck_store.create_deck, name, lane='flashcards', on_done=created,
+                       on_error=lambda e: messagebox.showerror("Error", f"Could not create the deck: {e}"))
+
+    # A deck still loading can't tell a repeated question, so count only the cards the database took
+    def _card_added(self, name, added):
+        deck_id, cards = self.decks[name]
+        self.decks[name] = (deck_id, cards + added)
+        self._refresh_deck_picker()
+        if added:
+            messagebox.showinfo("Success", "Flashcard added!")
+        else:
+            messagebox.showerror("Error", "This question already exists.")
+
+    # Keep cards added while the deck was still loading, unless another deck was opened meanwhile;
+    # a question the deck already had keeps its saved answer, as the database did
+    def _use_flashcards(self, deck_id, flashcards):
+        if deck_id != self.deck_id:
+            return
+        for question, answer in self.flashcards.items():
+            flashcards.setdefault(question, answer)
+        self.flashcards = flashcards
 
     def process_add_flashcard(self):
-        """Handle adding a flashcard."""
+        """Handle adding a flashcard to the open deck."""
+        if self.deck_id is None:
+            messagebox.showerror("Error", "The flashcard decks are still loading.")
+            return
         question = self.question_entry.get().strip()
         answer = self.answer_entry.get().strip()
         if question and answer:
             if question not in self.flashcards:
                 self.flashcards[question] = answer
-                self.save_flashcards()
-                messagebox.showinfo("Success", "Flashcard added!")
+                name = self.deck_name
+                self.io.submit(self.deck_store.add, self.deck_id, [(question, answer)], lane='flashcards',
+                               on_done=lambda added: self._card_added(name, added),
+                               on_error=lambda e: messagebox.showerror("Error", f"Could not save the flashcard: {e}"))
                 self.question_entry.delete(0, tk.END)
                 self.answer_entry.delete(0, tk.END)
             else:
@@ -556,16 +2739,17 @@ class FlashcardApp(FlashcardBase):
 
 
     def view_flashcards(self):
-        """Display all flashcards."""
+        """Display the flashcards of the open deck."""
         self.clear_frame()
-        tk.Label(self.root, text="Your Flashcards", font=("Arial", 20)).pack(pady=10)
+        tk.Label(self.current_frame, text=f"Your Flashcards: {self.deck_name or ''}", font=("Arial", 20)).pack(pady=10)
         if not self.flashcards:
-            tk.Label(self.root, text="No flashcards created yet.", font=("Arial", 16)).pack(pady=5)
+            tk.Label(self.current_frame, text="No flashcards created yet.", font=("Arial", 16)).pack(pady=5)
         else:
-            for question, answer in self.flashcards.items():
-                tk.Label(self.root, text=f"Q: {question}", font=("Arial", 16)).pack(pady=2)
-                tk.Label(self.root, text=f"A: {answer}", font=("Arial", 16), fg="gray").pack(pady=2)
-        tk.Button(self.root, text="Back to Menu", font=("Arial", 16), command=self.GUI_menu).pack(pady=10)
+            # A deck can hold tens of thousands of cards, so list them in a batched table
+            card_table = BatchedTreeview(self.current_frame, ("Question", "Answer"))
+            card_table.pack(padx=10, pady=5, fill="both", expand=True)
+            card_table.set_rows(list(self.flashcards.items()))
+        tk.Button(self.current_frame, text="Back to Menu", font=("Arial", 16), command=self.GUI_menu).pack(pady=10)
 
 
     def quiz_flashcards(self):
@@ -577,13 +2761,13 @@ class FlashcardApp(FlashcardBase):
         self.questions = list(self.flashcards.keys())
         self.current_index = 0
         self.correct_answers = 0
-        tk.Label(self.root, text="Quiz Yourself", font=("Arial", 20)).pack(pady=10)
-        self.question_label = tk.Label(self.root, text=self.questions[self.current_index], font=("Arial", 16))
+        tk.Label(self.current_frame, text="Quiz Yourself", font=("Arial", 20)).pack(pady=10)
+        self.question_label = tk.Label(self.current_frame, text=self.questions[self.current_index], font=("Arial", 16))
         self.question_label.pack(pady=10)
-        self.answer_entry = tk.Entry(self.root, width=50)
+        self.answer_entry = tk.Entry(self.current_frame, width=50)
         self.answer_entry.pack(pady=5)
-        tk.Button(self.root, text="Submit Answer", font=("Arial", 16), command=self.check_answer).pack(pady=5)
-        tk.Button(self.root, text="Back to Menu", font=("Arial", 16), command=self.GUI_menu).pack(pady=5)
+        tk.Button(self.current_frame, text="Submit Answer", font=("Arial", 16), command=self.check_answer).pack(pady=5)
+        tk.Button(self.current_frame, text="Back to Menu", font=("Arial", 16), command=self.GUI_menu).pack(pady=5)
 
 
     def check_answer(self):
@@ -611,10 +2795,237 @@ class FlashcardApp(FlashcardBase):
 
     def clear_frame(self):
         """Clear the current screen."""
-        for widget in self.root.winfo_children():
+        for widget in self.current_frame.winfo_children():
             widget.destroy()
     
 
+class Task:
+    """A to-do task: its text, its Important and Done status packed into bit flags, and the day it was done."""
+    __slots__ = ('task', 'flags', 'done_on')
+    IMPORTANT = 1
+    DONE = 2
+
+    def __init__(self, task, flags=0, done_on=None):
+        self.task = task
+        self.flags = flags
+        self.done_on = done_on
+
+    @property
+    def important(self):
+        return bool(self.flags & Task.IMPORTANT)
+
+    @property
+    def done(self):
+        return bool(self.flags & Task.DONE)
+
+
+class TaskStore:
+    """
+    Tasks of the to-do list keyed by ID, kept in ID order.
+
+    - Each task is a compact `Task` record in a dict, so lookups and updates by ID do not scan
+      the list.
+    - IDs come from a monotonic sequence that is saved with the tasks, so a deleted task's ID
+      is never handed out again.
+    - The bulk methods take many IDs at once and return the IDs they actually changed, so the
+      caller can update just those rows of the view in one pass.
+    - A status bitmap and a done-day column, both indexed by ID, are kept in step with the
+      records, so a view such as "Important and not done" is one vectorised mask.
+    - Substring search uses an index from each three-character slice of the text to the tasks
+      containing it; it is built on the first search and kept up to date after.
+    """
+    MARK = {True: "✅", False: "❌"}
+    FLAGS = {'important': Task.IMPORTANT, 'done': Task.DONE}
+    # Status bit of IDs that hold a task, next to the Task flags
+    LIVE = 4
+    # View name -> (status bits tested, value they must have, done today only)
+    VIEWS = {
+        'All': (0, 0, False),
+        'Important': (Task.IMPORTANT, Task.IMPORTANT, False),
+        'Important and not done': (Task.IMPORTANT | Task.DONE, Task.IMPORTANT, False),
+        'Not done': (Task.DONE, 0, False),
+        'Done': (Task.DONE, Task.DONE, False),
+        'Done today': (Task.DONE, Task.DONE, True),
+    }
+    GRAM = 3
+
+    def __init__(self, rows=(), next_id=1):
+        # Rows are (id, task, important, done, done_on) as stored in the database
+        self.tasks = {}
+        for task_id, task, important, done, done_on in sorted(rows, key=lambda row: row[0]):
+            flags = Task.IMPORTANT * bool(important) | Task.DONE * bool(done)
+            self.tasks[int(task_id)] = Task(task, flags, done_on if done else None)
+        self.next_id = max(next_id, next(reversed(self.tasks)) + 1 if self.tasks else 1)
+        self._grams = None
+
+        self._status = np.zeros(max(64, self.next_id), dtype=np.uint8)
+        self._done_on = np.zeros(len(self._status), dtype=np.int32)
+        if self.tasks:
+            ids = np.fromiter(self.tasks, dtype=np.int64, count=len(self.tasks))
+            self._status[ids] = [self.LIVE | record.flags for record in self.tasks.values()]
+            self._done_on[ids] = [record.done_on or 0 for record in self.tasks.values()]
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def __contains__(self, task_id):
+        return task_id in self.tasks
+
+    @staticmethod
+    def today():
+        """The current local day, as the proleptic ordinal stored in `done_on`."""
+        return datetime.date.today().toordinal()
+
+    def ids(self):
+        """Return the task IDs in order."""
+        return list(self.tasks)
+
+    def task(self, task_id):
+        """Return the text of a task."""
+        return self.tasks[task_id].task
+
+    def add(self, task):
+        """Add a task that is neither important nor done and return its newly allocated ID."""
+        task_id = self.next_id
+        self.next_id += 1
+        self.tasks[task_id] = Task(task)
+        if task_id >= len(self._status):
+            self._status = np.concatenate([self._status, np.zeros(len(self._status), dtype=np.uint8)])
+            self._done_on = np.concatenate([self._done_on, np.zeros(len(self._done_on), dtype=np.int32)])
+        self._status[task_id] = self.LIVE
+        if self._grams is not None:
+            self._index_text(task_id, task)
+        return task_id
+
+    def edit(self, task_id, task):
+        """Replace the text of a task."""
+        record = self.tasks[task_id]
+        if self._grams is not None:
+            self._unindex_text(task_id, record.task)
+            self._index_text(task_id, task)
+        record.task = task
+
+    def set_flag(self, task_ids, flag, value):
+        """
+        Set the 'important' or 'done' flag of the given tasks; return the IDs that changed.
+
+        - Marking a task done records today as its done day.
+        """
+        bit = self.FLAGS[flag]
+        today = self.today()
+        changed = []
+        for task_id in task_ids:
+            record = self.tasks.get(task_id)
+            if record is not None and bool(record.flags & bit) != value:
+                record.flags ^= bit
+                self._status[task_id] ^= bit
+                if bit == Task.DONE:
+                    record.done_on = today if value else None
+                    self._done_on[task_id] = today if value else 0
+                changed.append(task_id)
+        return changed
+
+    def delete(self, task_ids):
+        """Remove the given tasks and return the IDs that existed."""
+        deleted = []
+        for task_id in task_ids:
+            record = self.tasks.pop(task_id, None)
+            if record is not None:
+                self._status[task_id] = 0
+                self._done_on[task_id] = 0
+                if self._grams is not None:
+                    self._unindex_text(task_id, record.task)
+                deleted.append(task_id)
+        return deleted
+
+    def query(self, view='All', text=None):
+        """
+        Return the IDs, in order, of the tasks in a view whose text contains `text`.
+
+        - The view is a mask over the status bitmap, so no task records are visited.
+        - Text is matched case-insensitively; candidates come from the text index.
+        """
+        mask, want, today = self.VIEWS[view]
+        status = self._status[:self.next_id]
+        hits = (status & (self.LIVE | mask)) == (self.LIVE | want)
+        if today:
+            hits &= self._done_on[:self.next_id] == self.today()
+        task_ids = np.flatnonzero(hits)
+        if text:
+            task_ids = np.intersect1d(task_ids, self.search(text), assume_unique=True)
+        return task_ids.tolist()
+
+    def matches(self, task_id, view='All', text=None):
+        """Check a single task against the same view and text as `query`."""
+        record = self.tasks.get(task_id)
+        if record is None:
+            return False
+        mask, want, today = self.VIEWS[view]
+        if record.flags & mask != want or (today and record.done_on != self.today()):
+            return False
+        return not text or text.casefold() in record.task.casefold()
+
+    def search(self, text):
+        """Return the sorted IDs, as an array, of the tasks whose text contains `text`, ignoring case."""
+        text = text.casefold()
+        if len(text) < self.GRAM:
+            # Too short for the index; one pass over the texts
+            found = [task_id for task_id, record in self.tasks.items() if text in record.task.casefold()]
+            return np.array(found, dtype=np.int64)
+
+        grams = self._text_index()
+        candidates = None
+        for gram in sorted({text[index:index + self.GRAM] for index in range(len(text) - self.GRAM + 1)},
+                           key=lambda gram: len(grams.get(gram, ()))):
+            postings = grams.get(gram)
+            if not postings:
+                return np.zeros(0, dtype=np.int64)
+            candidates = set(postings) if candidates is None else candidates & postings
+        # Slices only narrow the candidates; check the whole text
+        found = [task_id for task_id in candidates if text in self.tasks[task_id].task.casefold()]
+        return np.array(sorted(found), dtype=np.int64)
+
+    def rows(self, task_ids=None):
+        """Return (id, task, important, done, done_on) rows as stored in the database, skipping deleted IDs."""
+        tasks = self.tasks
+        task_ids = tasks if task_ids is None else [task_id for task_id in task_ids if task_id in tasks]
+        return [(task_id, tasks[task_id].task, tasks[task_id].important, tasks[task_id].done, tasks[task_id].done_on)
+                for task_id in task_ids]
+
+    def display_rows(self, task_ids=None):
+        """Return the (ID, Task, Important, Done) strings shown in the Treeview."""
+        mark = self.MARK
+        return [(str(task_id), task, mark[important], mark[done])
+                for task_id, task, important, done, _ in self.rows(task_ids)]
+
+    def _text_index(self):
+        if self._grams is None:
+            self._grams = {}
+            for task_id, record in self.tasks.items():
+                self._index_text(task_id, record.task)
+        return self._grams
+
+    def _text_grams(self, task):
+        task = task.casefold()
+        return {task[index:index + self.GRAM] for index in range(len(task) - self.GRAM + 1)}
+
+    def _index_text(self, task_id, task):
+        for gram in self._text_grams(task):
+            postings = self._grams.get(gram)
+            if postings is None:
+                self._grams[gram] = {task_id}
+            else:
+                postings.add(task_id)
+
+    def _unindex_text(self, task_id, task):
+        for gram in self._text_grams(task):
+            postings = self._grams.get(gram)
+            if postings is not None:
+                postings.discard(task_id)
+                if not postings:
+                    del self._grams[gram]
+
+
 class ToDoApp(mainWindow):
     """
     GUI-based To-Do List application.
@@ -622,21 +3033,37 @@ class ToDoApp(mainWindow):
     - Allows users to add, delete ,save, and load To-Do list.
     - Implements a structured GUI for input and visualization.
     - Ensures proper file handling and data validation.
+    - Saves the changed tasks automatically once edits pause, and on exit.
     """
+    # Quiet period in milliseconds after the last edit before changes are saved automatically
+    AUTOSAVE_MS = 2000
+    # Pause in typing, in milliseconds, before the task search runs
+    SEARCH_DELAY_MS = 200
+
     # Constructor initializes the ToDoApp class
     def __init__(self, title, root_window, mainApp):
         self.root = root_window  # Root window for the application
         self.mainApp = mainApp  # Main app instance
-        self.tasks = pd.DataFrame(columns=["ID", "Task", "Important", "Done"])  # DataFrame to store tasks
+        self.database = mainApp.database
+        self.io = mainApp.io
+        self.store = TaskStore()  # Tasks keyed by ID
+        # IDs of tasks changed or deleted since the last save; saving writes only these rows
+        self.changed_tasks = set()
+        self.deleted_tasks = set()
+        self.autosave_job = None
+        self.search_job = None
+        # Edits wait for the saved tasks, so no ID is allocated against the empty placeholder store
+        self.loaded = False
+        self.window_title = title
         self.style = tb.Style()
-        self.style.configure('.', font=("Helvetica", 12))
 
         self.setup_ui()  # Set up the user interface
+        self.open_saved_tasks()
+        mainApp.exit_hooks['todo'] = self.autosave
 
     # Method to set up the UI components
     def setup_ui(self):
-        self.current_frame = ttk.Frame(self.root)  # Frame to hold UI elements
-        self.current_frame.pack(fill='both', expand=True)
+        self.current_frame = ttk.Frame(self.root)  # Frame to hold UI elements, packed by the screen manager
 
         # Label for task input field
         ttk.Label(self.current_frame, text="Enter a New Task:", font=('Arial', 30, 'bold'), bootstyle='primary').pack(padx=10, pady=10, anchor="w")
@@ -657,8 +3084,22 @@ class ToDoApp(mainWindow):
         ttk.Button(button_frame, text="Cancel Mark as Done", command=self.cancel_mark_as_done, bootstyle='info').pack(side="left", padx=5)
         ttk.Button(button_frame, text="Cancel Important", command=self.cancel_mark_as_important, bootstyle='info').pack(side="left", padx=5)
 
-        # Treeview to display tasks
-        self.task_treeview = ttk.Treeview(self.current_frame, columns=("ID", "Task", "Important", "Done"), show="headings", bootstyle='primary')
+        # View and search over the tasks, answered from the store's indexes
+        view_frame = ttk.Frame(self.current_frame)
+        view_frame.pack(padx=10, pady=(10, 0), fill="x")
+        ttk.Label(view_frame, text="Show:").pack(side="left", padx=5)
+        self.view_var = tk.StringVar(value='All')
+        ttk.Combobox(view_frame, textvariable=self.view_var, values=list(TaskStore.VIEWS), state='readonly',
+                     bootstyle='primary').pack(side="left", padx=5)
+        ttk.Label(view_frame, text="Search:").pack(side="left", padx=5)
+        self.search_var = tk.StringVar()
+        ttk.Entry(view_frame, textvariable=self.search_var, width=30, bootstyle='primary').pack(side="left", padx=5)
+        self.view_var.trace_add('write', self.refresh_view)
+        self.search_var.trace_add('write', self._schedule_search)
+
+        # Treeview to display tasks, filled in batches
+        self.task_table = BatchedTreeview(self.current_frame, ("ID", "Task", "Important", "Done"), bootstyle='primary')
+        self.task_treeview = self.task_table.tree
         self.task_treeview.heading("ID", text="ID", anchor='w')
         self.task_treeview.heading("Task", text="Task", anchor='w')
         self.task_treeview.heading("Important", text="Important", anchor='w')
@@ -667,7 +3108,7 @@ class ToDoApp(mainWindow):
         self.task_treeview.column("Task", width=300)
         self.task_treeview.column("Important", width=100)
         self.task_treeview.column("Done", width=100)
-        self.task_treeview.pack(padx=10, pady=10, fill="both", expand=True)
+        self.task_table.pack(padx=10, pady=10, fill="both", expand=True)
 
         # Control frame with buttons for saving, loading, deleting tasks
         control_frame = ttk.Frame(self.current_frame)
@@ -679,40 +3120,92 @@ class ToDoApp(mainWindow):
         ttk.Button(control_frame, text="Delete Task", command=self.delete_task).pack(side="left", padx=10)
         ttk.Button(control_frame, text="Back to Menu", command=self.return_to_main_menu).pack(side="left", padx=10)
 
+    # Refuse edits until the saved tasks are in memory
+    def _check_loaded(self):
+        if not self.loaded:
+            messagebox.showerror("Error", "The saved tasks are still loading.")
+        return self.loaded
+
+    # Task IDs of the selected rows; the Treeview iids are the IDs
+    def _selected_ids(self):
+        return [int(iid) for iid in self.task_treeview.selection()]
+
+    # Redraw only the given rows, dropping those that left the current view, and mark them for the next save
+    def _show_changes(self, task_ids):
+        self.changed_tasks.update(task_ids)
+        view, text = self._current_view()
+        shown = [task_id for task_id in task_ids if self.store.matches(task_id, view, text)]
+        hidden = set(task_ids).difference(shown)
+        self.task_table.update_rows(self.store.display_rows(shown), [str(task_id) for task_id in shown])
+        self.task_table.delete_rows([str(task_id) for task_id in hidden])
+        self._schedule_autosave()
+
+    # Selected view name and search text, None when the search box is empty
+    def _current_view(self):
+        return self.view_var.get(), self.search_var.get().strip() or None
+
+    def refresh_view(self, *args):
+        """Show the tasks of the selected view matching the search, changing only the rows that differ."""
+        if self.search_job is not None:
+            self.root.after_cancel(self.search_job)
+            self.search_job = None
+        task_ids = self.store.query(*self._current_view())
+        self.task_table.show_rows([str(task_id) for task_id in task_ids],
+                                  lambda iids: self.store.display_rows([int(iid) for iid in iids]))
+
+    # Search once typing pauses rather than on every keystroke
+    def _schedule_search(self, *args):
+        if self.search_job is not None:
+            self.root.after_cancel(self.search_job)
+        self.search_job = self.root.after(self.SEARCH_DELAY_MS, self.refresh_view)
+
+    # Restart the autosave timer, so a burst of edits is saved together
+    def _schedule_autosave(self):
+        self._cancel_autosave()
+        self.autosave_job = self.root.after(self.AUTOSAVE_MS, self.autosave)
+
+    def _cancel_autosave(self):
+        if self.autosave_job is not None:
+            self.root.after_cancel(self.autosave_job)
+            self.autosave_job = None
+
+    def autosave(self):
+        """Save the tasks changed since the last save, if any, without confirmation dialogs."""
+        self._cancel_autosave()
+        if self.changed_tasks or self.deleted_tasks:
+            self._submit_save(on_error=lambda e: print(f"Could not autosave tasks: {e}"))
+
     # Method to cancel the "Done" mark on a task
     def cancel_mark_as_done(self):
-        selected = self.task_treeview.selection()
+        if not self._check_loaded():
+            return
+        selected = self._selected_ids()
         if selected:
-            for item in selected:
-                task_id = int(self.task_treeview.item(item, "values")[0])
-                self.tasks.loc[self.tasks["ID"] == task_id, "Done"] = "❌"
-            self.update_task_treeview()
+            self._show_changes(self.store.set_flag(selected, 'done', False))
         else:
             messagebox.showwarning("Selection Error", "Please select a task to cancel mark as done!")
 
     # Method to cancel the "Important" mark on a task
     def cancel_mark_as_important(self):
-        selected = self.task_treeview.selection()
+        if not self._check_loaded():
+            return
+        selected = self._selected_ids()
         if selected:
-            for item in selected:
-                task_id = int(self.task_treeview.item(item, "values")[0])
-                self.tasks.loc[self.tasks["ID"] == task_id, "Important"] = "❌" 
-            self.update_task_treeview()
+            self._show_changes(self.store.set_flag(selected, 'important', False))
         else:
             messagebox.showwarning("Selection Error", "Please select a task to cancel mark as important!")
 
     # Method to add a new task
     def add_task(self):
+        if not self._check_loaded():
+            return
         task_text = self.task_entry.get().strip() 
         if task_text:
-            new_task = {
-                "ID": len(self.tasks) + 1,
-                "Task": task_text,
-                "Important": "❌",
-                "Done": "❌" 
-            }
-            self.tasks = pd.concat([self.tasks, pd.DataFrame([new_task])], ignore_index=True)  # Add the task to the DataFrame
-            self.update_task_treeview() 
+            task_id = self.store.add(task_text)
+            self.changed_tasks.add(task_id)
+            if self.store.matches(task_id, *self._current_view()):
+                self.task_table.append_rows(self.store.display_rows([task_id]), [str(task_id)])
+            self._schedule_autosave()
             self.task_entry.delete(0, tk.END) 
         else:
             messagebox.showwarning("Input Error", "Task cannot be empty!") 
@@ -720,29 +3213,34 @@ class ToDoApp(mainWindow):
     # Method to delete a task
     def delete_task(self):
         
-        selected = self.task_treeview.selection()
+        if not self._check_loaded():
+            return
+        selected = self._selected_ids()
         if selected:
             confirm = messagebox.askyesno("Delete Confirmation", "Are you sure you want to delete the selected task(s)?")
             if confirm:
-                for item in selected:
-                    task_id = int(self.task_treeview.item(item, "values")[0])
-                    self.tasks = self.tasks[self.tasks["ID"] != task_id]  # Remove the task from the DataFrame
-                    self.update_task_treeview()
+                deleted = self.store.delete(selected)
+                self.changed_tasks.difference_update(deleted)
+                self.deleted_tasks.update(deleted)
+                self.task_table.delete_rows([str(task_id) for task_id in deleted])
+                self._schedule_autosave()
         else:
             messagebox.showwarning("Selection Error", "Please select a task to delete!")
 
     # Method to edit a selected task
     def edit_task(self):
-        selected = self.task_treeview.selection()
+        if not self._check_loaded():
+            return
+        selected = self._selected_ids()
         if selected:
-            task_id = int(self.task_treeview.item(selected[0], "values")[0])  # Get the task ID
-            old_task = self.tasks.loc[self.tasks["ID"] == task_id, "Task"].values[0]
+            task_id = selected[0]
+            old_task = self.store.task(task_id)
             new_task = self.task_entry.get().strip()  # Get the new task text from the entry field
             if new_task:
                 confirm = messagebox.askyesno("Edit Confirmation", f"Are you sure you want to change the task from '{old_task}' to '{new_task}'?")
                 if confirm:
-                    self.tasks.loc[self.tasks["ID"] == task_id, "Task"] = new_task  # Update the task in the DataFrame
-                    self.update_task_treeview() 
+                    self.store.edit(task_id, new_task)
+                    self._show_changes([task_id])
                     self.task_entry.delete(0, tk.END)  
             else:
                 messagebox.showwarning("Input Error", "Task cannot be empty!")  
@@ -751,87 +3249,425 @@ class ToDoApp(mainWindow):
 
     # Method to mark a task as done
     def mark_as_done(self):
-        selected = self.task_treeview.selection()  
+        if not self._check_loaded():
+            return
+        selected = self._selected_ids()
         if selected:
-            for item in selected:
-                task_id = int(self.task_treeview.item(item, "values")[0])
-                self.tasks.loc[self.tasks["ID"] == task_id, "Done"] = "✅" 
-                self.update_task_treeview()
+            self._show_changes(self.store.set_flag(selected, 'done', True))
         else:
             messagebox.showwarning("Selection Error", "Please select a task to mark as done!")
 
     # Method to mark a task as important
     def mark_as_important(self):
-        selected = self.task_treeview.selection() 
+        if not self._check_loaded():
+            return
+        selected = self._selected_ids()
         if selected:
-            for item in selected:
-                task_id = int(self.task_treeview.item(item, "values")[0])
-                self.tasks.loc[self.tasks["ID"] == task_id, "Important"] = "✅" 
-            self.update_task_treeview()
+            self._show_changes(self.store.set_flag(selected, 'important', True))
         else:
             messagebox.showwarning("Selection Error", "Please select a task to mark as important!")
 
-    # Method to save tasks to a CSV file
+    # Method to save the tasks changed since the last save in one background transaction
     def save_tasks(self):
-        try:
-            self.tasks.to_csv("tasks.csv", index=False)  # Save tasks to CSV file
-            messagebox.showinfo("Success", "Tasks saved successfully to tasks.csv!")
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not save tasks: {e}") 
+        if not self._check_loaded():
+            return
+        self._cancel_autosave()
+        self._submit_save(on_done=lambda _: messagebox.showinfo("Success", "Tasks saved successfully!"),
+                          on_error=lambda e: messagebox.showerror("Error", f"Could not save tasks: {e}"))
 
-    # Method to load tasks from a CSV file
-    def load_tasks(self):
-        try:
-            self.tasks = pd.read_csv("tasks.csv") 
-            self.update_task_treeview()
-            messagebox.showinfo("Success", "Tasks loaded successfully from tasks.csv!")  
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not load tasks: {e}") 
+    # Write the dirty rows on the I/O executor; the cost follows the number of edits, not the list size
+    def _submit_save(self, on_done=None, on_error=None):
+        rows, deleted, next_id = self._collect_changes()
+
+        def failed(error):
+            # Keep the rows dirty so the next save retries them
+            self.changed_tasks.update(row[0] for row in rows)
+            self.deleted_tasks.update(deleted)
+            on_error(error)
 
-    # Method to update the task treeview with current tasks
+        self.io.submit(self._write_tasks, rows, deleted, next_id, lane='tasks', on_done=on_done, on_error=failed)
+
+    # Method to reload the saved tasks, discarding unsaved changes
+    def load_tasks(self):
+        def loaded(tasks):
+            self._use_saved_tasks(tasks)
+            messagebox.showinfo("Success", "Tasks loaded successfully!")
+
+        self.io.submit(self._read_saved_tasks, lane='tasks', on_done=loaded,
+                       on_error=lambda e: messagebox.showerror("Error", f"Could not load tasks: {e}"))
+
+    # Method to show the saved tasks when the list opens
+    def open_saved_tasks(self):
+        self.io.submit(self._read_saved_tasks, lane='tasks', on_done=self._use_saved_tasks,
+                       on_error=lambda e: messagebox.showerror("Error", f"Could not load tasks: {e}"))
+
+    def _use_saved_tasks(self, store):
+        self._cancel_autosave()
+        self.store = store
+        self.loaded = True
+        self.changed_tasks.clear()
+        self.deleted_tasks.clear()
+        self.update_task_treeview()
+
+    # Rows of the changed tasks as stored in the database, the deleted IDs and the ID sequence;
+    # the dirty sets are handed over with them
+    def _collect_changes(self):
+        rows = self.store.rows(sorted(self.changed_tasks))
+        deleted = list(self.deleted_tasks)
+        self.changed_tasks.clear()
+        self.deleted_tasks.clear()
+        return rows, deleted, self.store.next_id
+
+    # Rows of a tasks.csv DataFrame as stored in the database
+    def _task_rows(self, tasks):
+        return [(int(task_id), task, important == TaskStore.MARK[True], done == TaskStore.MARK[True], None)
+                for task_id, task, important, done in tasks[["ID", "Task", "Important", "Done"]].itertuples(index=False)]
+
+    # Runs on the I/O executor; the ID sequence is saved so deleted IDs are not reused after a restart
+    def _write_tasks(self, rows, deleted, next_id):
+        with self.database.transaction() as connection:
+            connection.executemany("DELETE FROM tasks WHERE id = ?", [(task_id,) for task_id in deleted])
+            connection.executemany("INSERT OR REPLACE INTO tasks (id, task, important, done, done_on) VALUES (?, ?, ?, ?, ?)", rows)
+            self.database.set_setting(connection, 'tasks', {'next_id': next_id})
+
+    # Runs on the I/O executor, importing the old tasks.csv only the first time; writing the
+    # 'tasks' setting marks the import done, so deleting every task never brings it back
+    def _read_saved_tasks(self):
+        saved = self.database.get_setting('tasks')
+        if saved is None:
+            rows = self._task_rows(pd.read_csv("tasks.csv")) if os.path.exists("tasks.csv") else []
+            store = TaskStore(rows)
+            self._write_tasks(store.rows(), [], store.next_id)
+            return store
+        rows = self.database.query("SELECT id, task, important, done, done_on FROM tasks ORDER BY id")
+        return TaskStore(rows, saved.get('next_id', 1))
+
+    # Method to redraw the whole task treeview, used when a different task list is loaded
     def update_task_treeview(self):
-        for item in self.task_treeview.get_children():
-            self.task_treeview.delete(item)  # Remove all existing rows
-        for _, task in self.tasks.iterrows(): # Add each task to the treeview
-            self.task_treeview.insert(
-                "", "end",
-                values=(task["ID"], task["Task"], task["Important"], task["Done"]),
-            )
+        task_ids = self.store.query(*self._current_view())
+        self.task_table.set_rows(self.store.display_rows(task_ids), [str(task_id) for task_id in task_ids])
 
-    # Method to return to the main menu
+    # Method to return to the main menu, keeping the task list as it is
     def return_to_main_menu(self):
-        self.mainApp.clear_frame()
-        self.mainApp.menuGUI() 
+        self.mainApp.menuGUI()
+
+    def on_show(self):
+        self.root.title(self.window_title)
+        self.style.configure('.', font=("Helvetica", 12))
+
+
+class SessionLog:
+    """
+    Structured Pomodoro session log, one database row per finished session.
+
+    - Each entry holds the local start and end time, cycle, session type and the planned and
+      actual (running, pauses excluded) duration in seconds.
+    - `record` only buffers; once a batch is full or `flush_interval` seconds have passed, the
+      buffer is inserted in one transaction on the I/O executor, so the UI thread never waits
+      on the database.
+    - `page` reads one page of a date range through the start-time index, continuing from the
+      last row of the previous page instead of counting past it.
+    """
+    TIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+    def __init__(self, database, executor, batch_size=32, flush_interval=300.0):
+
+        self.database = database
+        self.executor = executor
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pending = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def record(self, start, end, cycle, session_type, planned, actual):
+        """Buffer one finished session; `start` and `end` are epoch seconds."""
+        entry = (time.strftime(self.TIME_FORMAT, time.localtime(start)),
+                 time.strftime(self.TIME_FORMAT, time.localtime(end)),
+                 cycle, session_type, round(planned, 1), round(actual, 1))
+        with self._lock:
+            self.pending.append(entry)
+            full = len(self.pending) >= self.batch_size
+        if full or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush_async()
+
+    def flush_async(self):
+        """Write out the buffer on the I/O executor; flushes queued behind a running one are merged."""
+        self._last_flush = time.monotonic()
+        self.executor.submit(self.flush, lane='pomodoro-log', merge='flush')
+
+    def flush(self):
+        """Write out the buffer on the calling thread and return how many entries were written."""
+        with self._write_lock:
+            with self._lock:
+                entries, self.pending = self.pending, []
+            if not entries:
+                return 0
+            try:
+                with self.database.transaction() as connection:
+                    connection.executemany(
+                        "INSERT INTO pomodoro_sessions (start, end, cycle, type, planned, actual) VALUES (?, ?, ?, ?, ?, ?)",
+                        entries)
+            except Exception:
+                # Put the entries back ahead of anything recorded since, so the next flush retries them
+                with self._lock:
+                    self.pending = entries + self.pending
+                raise
+            return len(entries)
+
+    def exists(self):
+        return bool(self.database.query("SELECT EXISTS (SELECT 1 FROM pomodoro_sessions)")[0][0])
+
+    def page(self, from_date=None, to_date=None, offset=None, limit=50):
+        """
+        Return up to `limit` entries dated within [from_date, to_date] and the offset of the next page.
+
+        - Dates are 'YYYY-MM-DD' strings; either bound may be None.
+        - Pass the returned offset back to continue; it is None once the range is exhausted.
+        """
+        after_start, after_id = offset if offset is not None else ("", 0)
+        rows = self.database.query(
+            "SELECT id, start, end, cycle, type, planned, actual FROM pomodoro_sessions"
+            " WHERE start >= ? AND start <= ? AND (start > ? OR (start = ? AND id > ?))"
+            " ORDER BY start, id LIMIT ?",
+            (from_date or "", (to_date or "9999-12-31") + "T23:59:59", after_start, after_start, after_id, limit + 1))
+        entries = [{'start': start, 'end': end, 'cycle': cycle, 'type': session_type,
+                    'planned': planned, 'actual': actual}
+                   for _, start, end, cycle, session_type, planned, actual in rows[:limit]]
+        if len(rows) <= limit:
+            return entries, None
+        return entries, (rows[limit - 1][1], rows[limit - 1][0])
+
+
+class VirtualClock:
+    """Manually advanced clock for driving timers in simulations and benchmarks."""
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class TickScheduler:
+    """
+    Shared scheduler for any number of timers, kept as a min-heap of deadlines.
+
+    - A timer has at most one live deadline; rescheduling or cancelling marks the old heap
+      entry dead instead of searching the heap for it.
+    - `run_due` fires every deadline that has passed by calling `timer.expire(deadline)`.
+    - The clock is injectable, so timers can be stepped in virtual time without a display.
+    """
+    def __init__(self, clock=time.monotonic):
+
+        self.clock = clock
+        self._heap = []
+        self._entries = {}
+        self._counter = itertools.count()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def schedule(self, timer, deadline):
+        self.cancel(timer)
+        entry = [deadline, next(self._counter), timer, True]
+        self._entries[timer] = entry
+        heapq.heappush(self._heap, entry)
+
+    def cancel(self, timer):
+        entry = self._entries.pop(timer, None)
+        if entry is not None:
+            entry[3] = False
+
+    def next_deadline(self):
+        """Return the earliest live deadline, or None when nothing is scheduled."""
+        while self._heap and not self._heap[0][3]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def run_due(self, now=None):
+        """Fire every timer whose deadline is at or before `now` and return how many fired."""
+        if now is None:
+            now = self.clock()
+        fired = 0
+        while self._heap and self._heap[0][0] <= now:
+            deadline, _, timer, live = heapq.heappop(self._heap)
+            if not live:
+                continue
+            del self._entries[timer]
+            timer.expire(deadline)
+            fired += 1
+        return fired
+
+
+class PomodoroEngine:
+    """
+    Headless Pomodoro state machine.
+
+    - A cycle runs Work, Short Break, Work, Long Break; finishing the long break completes a Pomodoro.
+    - Session ends are deadlines in a shared TickScheduler, and the next session starts from the
+      previous deadline, so late wake-ups never make a cycle drift.
+    - Changes are reported to `listeners` as `listener(engine, event)`, with event one of
+      'session', 'session_end', 'cycle_complete', 'paused', 'resumed' or 'reset'.
+    - On 'session_end' the session is still current and `remaining` holds the unused seconds.
+    """
+    SESSIONS = ("Work Duration", "Short Break", "Work Duration", "Long Break")
+
+    def __init__(self, name, scheduler, work=25 * 60, short_break=5 * 60, long_break=15 * 60):
+
+        self.name = name
+        self.scheduler = scheduler
+        self.durations = {}
+        self.set_durations(work, short_break, long_break)
+        self.listeners = []
+
+        self.cycle = 0
+        self.session_type = None
+        self.running = False
+        self.remaining = 0
+        self.deadline = None
+        self.pomodoro_count = 0
+
+    def set_durations(self, work, short_break, long_break):
+        """Set the session lengths in seconds."""
+        self.durations = {"Work Duration": work, "Short Break": short_break, "Long Break": long_break}
+
+    def start(self):
+        """Start a new cycle from the first work session."""
+        self._end_session(self.time_left())
+        self.cycle = 0
+        self._begin_session(self.scheduler.clock(), running=True)
+
+    def pause(self):
+        if not self.running:
+            return
+        self.remaining = max(0, self.deadline - self.scheduler.clock())
+        self.running = False
+        self.scheduler.cancel(self)
+        self._emit('paused')
+
+    def resume(self, start=None):
+        """Continue the current session; `start` defaults to now."""
+        if self.running or self.session_type is None:
+            return
+        self.running = True
+        self.deadline = (self.scheduler.clock() if start is None else start) + self.remaining
+        self.scheduler.schedule(self, self.deadline)
+        self._emit('resumed')
+
+    def skip(self):
+        """End the current session early; the next one starts paused."""
+        self._end_session(self.time_left())
+        self._begin_session(self.scheduler.clock(), running=False)
+
+    def reset(self):
+        self._end_session(self.time_left())
+        self.cycle = 0
+        self.session_type = None
+        self.running = False
+        self.remaining = 0
+        self.deadline = None
+        self.pomodoro_count = 0
+        self._emit('reset')
+
+    def time_left(self):
+        """Seconds left in the current session."""
+        if self.running:
+            return max(0, self.deadline - self.scheduler.clock())
+        return self.remaining
+
+    def expire(self, deadline):
+        """Called by the scheduler when the current session's deadline has passed."""
+        self._end_session(0)
+        self._begin_session(deadline, running=True)
+
+    def _end_session(self, remaining):
+        if self.session_type is None:
+            return
+        self.scheduler.cancel(self)
+        self.running = False
+        self.remaining = remaining
+        self._emit('session_end')
+
+    def _begin_session(self, start, running):
+        if self.cycle == len(self.SESSIONS):
+            # After work, break, work, long break the Pomodoro is complete
+            self.cycle = 0
+            self.session_type = None
+            self.running = False
+            self.remaining = 0
+            self.pomodoro_count += 1
+            self._emit('cycle_complete')
+            return
+
+        self.session_type = self.SESSIONS[self.cycle]
+        self.cycle += 1
+        self.running = False
+        self.remaining = self.durations[self.session_type]
+        self._emit('session')
+        if running:
+            self.resume(start)
+
+    def _emit(self, event):
+        for listener in self.listeners:
+            listener(self, event)
 
 
 class Timer(mainWindow):
+    """
+    Tk driver for Pomodoro engines.
+
+    - Every engine shares one TickScheduler, which is pumped from `root.after`.
+    - The pump wakes at the next deadline or when the displayed second changes, whichever comes
+      first; nothing sleeps, no nested event loop is entered and the stack depth stays constant.
+    """
+    scheduler = TickScheduler()
+
     def __init__(self):
-        # 'running' tracks whether the timer is active
-        # 'remaining_time' holds the time left in seconds
-        self.running = False
-        self.remaining_time = 0
+        self._after_id = None
+        self._root = None
+        self._label = None
+        self.engine = None
 
 
     def countdown(self, root, label):
         """
-        Handles the countdown logic for the timer.
-        Updates the UI label with remaining time and decrements time every second.
+        Keep the label showing the engine's time left while it runs.
         Handles potential exceptions during runtime.
         """
+        self._root = root
+        self._label = label
+        self.cancel_tick()
+        self._tick()
+
+    def cancel_tick(self):
+        if self._after_id is not None:
+            self._root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _tick(self):
+        self._after_id = None
         try:
-            while self.remaining_time > 0 and self.running:
-                minutes_left, seconds_left = divmod(self.remaining_time, 60)
-                label.config(text=f"{minutes_left:02} : {seconds_left:02}")
-                root.update()
-                time.sleep(1)  # Pause for a second
-                self.remaining_time -= 1
+            self.scheduler.run_due()
+            left = self.engine.time_left()
+            if self.engine.session_type is not None:
+                minutes_left, seconds_left = divmod(math.ceil(left), 60)
+                self._label.config(text=f"{minutes_left:02} : {seconds_left:02}")
+            if not self.engine.running:
+                return
 
-            # When the countdown finishes, go to the next cycle
-            if self.remaining_time == 0 and self.running:
-                self.next_cycle()
+            # Wake up when the displayed second changes or the next deadline is due
+            delay = left - (math.ceil(left) - 1) if left > 0 else 0
+            next_deadline = self.scheduler.next_deadline()
+            if next_deadline is not None:
+                delay = min(delay, next_deadline - self.scheduler.clock())
+            self._after_id = self._root.after(max(1, math.ceil(delay * 1000)), self._tick)
 
         except Exception as e:
-            label.config(text="Error")
+            self._label.config(text="Error")
             print(f"An error occurred: {e}")
 
 
@@ -847,16 +3683,16 @@ class Pomodorotimer(Timer):
         super().__init__()
         self.root = root_window
         self.mainApp = mainApp
-        self.root.title(title)
+        self.window_title = title
         self.current_frame = ttk.Frame(self.root)
-        self.current_frame.pack(fill='both',expand=True)
         self.style = tb.Style()
-        self.style.configure('.', font=("Helvetica", 25))
     
-        # Timer configuration
-        self.cycles = 4
-        self.current_cycle = 1
-        self.pomodoro_count = 0
+        # Timer configuration, the engine runs the cycle and this view follows its events
+        self.engine = PomodoroEngine("Pomodoro", self.scheduler)
+        self.engine.listeners.append(self.on_engine_event)
+        self.session_log = SessionLog(mainApp.database, mainApp.io)
+        mainApp.exit_hooks['pomodoro'] = self.session_log.flush_async
+        self.session_started = None
     
         self.setupGUI()
 
@@ -923,43 +3759,48 @@ class Pomodorotimer(Timer):
         self.history.pack(side='left', padx=10)
 
     
+    # The timer keeps running while the menu or another module is shown
     def return_to_main_menu(self):
 
-        self.clear_frame()
+        self.session_log.flush_async()
         self.mainApp.menuGUI()    
 
+    def on_show(self):
+        self.root.title(self.window_title)
+        self.style.configure('.', font=("Helvetica", 25))
+
     # Starts the timer and toggles between 'Start' and 'Stop' button based on the current state
     def timer_start(self):
-        if not self.running:
+        if not self.engine.running:
             # Validate input values (duration, breaks)
             if self.update():
-                self.running = True
+                self.engine.set_durations(self.duration * 60, self.shortbreak * 60, self.longbreak * 60)
                 self.start.config(text="Stop", command=self.timer_pause)
-                self.run()
+                self.engine.start()
+                self.countdown(self.root, self.label)
             else:
                 print("Invalid Input")
         else:
-            self.running = False
-            self.start.config(text="Resume", command=self.timer_resume)
+            self.timer_pause()
 
 
     def timer_pause(self):
-        self.running = False
+        self.engine.pause()
+        self.cancel_tick()
         self.start.config(text="Resume", command=self.timer_resume)
 
     # Resumes the timer countdown from the remaining time
     def timer_resume(self):
-        self.running = True
         self.start.config(text="Stop", command=self.timer_pause)
 
         # Resume countdown from the remaining time
+        self.engine.resume()
         self.countdown(self.root, self.label)
 
 
     def timer_reset(self):
-        self.running = False
-        self.current_cycle = 0
-        self.remaining_time = 0  # Reset remaining time
+        self.engine.reset()
+        self.cancel_tick()
         self.label.config(text="00 : 00")
 
         #Reset UI Button to default color setting
@@ -973,8 +3814,7 @@ class Pomodorotimer(Timer):
 
         self.start.config(text="Start", command=self.timer_start)
 
-        self.pomodoro_count = 0
-        self.pomodoro_count_label.config(text=f"Pomodoros Completed: {self.pomodoro_count}")
+        self.pomodoro_count_label.config(text=f"Pomodoros Completed: {self.engine.pomodoro_count}")
         self.session_type_label.config(text='Current Session: None', bootstyle='danger')
 
     
@@ -990,132 +3830,53 @@ class Pomodorotimer(Timer):
     def timer_skip(self):
 
         # Prevent skipping at the end of cycle
-        if (self.current_cycle == 1) and (not self.session_type == 'Long Break' or not self.session_type == 'Work Duration' \
-                                          or not self.session_type == 'Short Break'):
+        if self.engine.session_type is None:
             messagebox.showwarning(title='Skip Error', message='Press Start or Reset to continue the cycle!')
             return
 
-        if self.running:
-            self.running = False
+        if self.engine.running:
+            self.cancel_tick()
             self.start.config(text="Start", command=self.timer_resume)
             self.work_duration_label.config(bootstyle='primary')
             self.short_break_label.config(bootstyle='primary')
             self.long_break_label.config(bootstyle='primary')
-        self.next_cycle()
+        self.engine.skip()
 
-    # Manages the transitions between different session types (work, short break, long break)
-    def next_cycle(self):
-        if self.current_cycle == 5:  # After 4 cycles (work, break, work, long break)
-            self.current_cycle = 1 # Reset the cycle counter for the next Pomodoro session
+    # Follows the engine through the sessions of a cycle (work, short break, long break)
+    def on_engine_event(self, engine, event):
+        style_elements = [self.current_frame, self.label, 
+            self.work_duration_label, self.short_break_label, self.long_break_label,
+            self.start, self.skip, self.reset, self.quit_button, self.session_type_label
+            ]
+
+        if event == 'cycle_complete':  # After 4 sessions (work, break, work, long break)
+            self.cancel_tick()
             self.label.config(text="End! Reset or Start", bootstyle='danger')
             self.start.config(text="Start", command=self.timer_start)
             
             # Change all elements to danger style after completing a full cycle
-            danger_style_elements = [
-                self.current_frame, self.label, 
-                self.work_duration_label, self.short_break_label, self.long_break_label,
-                self.start, self.skip, self.reset, self.quit_button, self.session_type_label
-            ]
-            
-            for element in danger_style_elements:
+            for element in style_elements:
                 element.config(bootstyle='danger')
 
-            # Increment Pomodoro Counter after a full cycle
-            self.pomodoro_count += 1
-            self.pomodoro_count_label.config(text=f"Pomodoros Completed: {self.pomodoro_count}")
-
-            # Update Session Type & Reset time to default
+            # Update the Pomodoro counter and session type
+            self.pomodoro_count_label.config(text=f"Pomodoros Completed: {engine.pomodoro_count}")
             self.session_type_label.config(text=f"Current Session: None")
-            self.remaining_time = 0
-
-            # Log the completed cycle            
-            return
-
-        # Continue to the next session within the cycle
-        if self.current_cycle == 1:
-            # First work session
-            self.session_type = "Work Duration"
-            self.label.config(bootstyle='primary', text=f"{self.duration:02} : 00")
 
-            primary_style_elements = [self.current_frame, self.label, 
-                self.work_duration_label, self.short_break_label, self.long_break_label,
-                self.start, self.skip, self.reset, self.quit_button, self.session_type_label
-                ]
+        elif event == 'session_end':
+            self.log_session(engine)
 
-            for element in primary_style_elements:
-                element.config(bootstyle='primary')
-
-            # Update session type label and other UI elements
-            self.session_type_label.config(text=f"Current Session: {self.session_type}")
-            self.remaining_time = self.duration * 60
+        elif event == 'session':
+            # Work sessions are primary, short breaks info and long breaks success
+            style = {"Work Duration": 'primary', "Short Break": 'info', "Long Break": 'success'}[engine.session_type]
+            minutes = engine.durations[engine.session_type] // 60
+            self.label.config(bootstyle=style, text=f"{minutes:02} : 00")
 
-            self.log_session(self.session_type)
+            for element in style_elements:
+                element.config(bootstyle=style)
 
-        elif self.current_cycle == 2:
-            # Short break
-            self.session_type = "Short Break"
-            self.label.config(bootstyle='info', text=f"{self.shortbreak:02} : 00")
-
-            info_style_elements = [self.current_frame, self.label, 
-                self.work_duration_label, self.short_break_label, self.long_break_label,
-                self.start, self.skip, self.reset, self.quit_button, self.session_type_label
-                ]
-            
-            for element in info_style_elements:
-                element.config(bootstyle='info')
-
-            # Update session type label and other UI elements
-            self.session_type_label.config(text=f"Current Session: {self.session_type}")
-            self.remaining_time = self.shortbreak * 60
-
-            self.log_session(self.session_type)
-
-        elif self.current_cycle == 3:
-            # Second work session
-            self.session_type = "Work Duration"
-            self.label.config(bootstyle='primary', text=f"{self.duration:02} : 00")
-
-            primary_style_elements = [self.current_frame, self.label, 
-                self.work_duration_label, self.short_break_label, self.long_break_label,
-                self.start, self.skip, self.reset, self.quit_button, self.session_type_label
-                ]  
-            
-            for element in primary_style_elements:
-                element.config(bootstyle='primary')
-
-            # Update session type label and other UI elements
-            self.session_type_label.config(text=f"Current Session: {self.session_type}")
-            self.remaining_time = self.duration * 60
-
-            self.log_session(self.session_type)
-
-        elif self.current_cycle == 4:
-            # Long break
-            self.session_type = "Long Break"
-            self.label.config(bootstyle='success', text=f"{self.longbreak:02} : 00")
-
-            success_style_elements = [self.current_frame, self.label, 
-                self.work_duration_label, self.short_break_label, self.long_break_label,
-                self.start, self.skip, self.reset, self.quit_button, self.session_type_label
-                ]  
-            
-            for element in success_style_elements:
-                element.config(bootstyle='success')
-
-            # Update session type label and other UI elements
-            self.session_type_label.config(text=f"Current Session: {self.session_type}")
-            self.remaining_time = self.longbreak * 60
-
-            self.log_session(self.session_type)
-
-        self.current_cycle += 1  # Increment cycle for the next session
-
-        # Start the countdown for the next session
-        self.countdown(self.root, self.label)
-
-    def run(self):
-        if self.running:
-            self.next_cycle()  # Start or continue the cycle
+            # Update session type label, the session is logged once it ends
+            self.session_type_label.config(text=f"Current Session: {engine.session_type}")
+            self.session_started = time.time()
 
 
     def update(self):
@@ -1142,38 +3903,25 @@ class Pomodorotimer(Timer):
             print(f"Error: {e}")
             return False  # Validation failed
 
-    # Log each session cycle into a text file for tracking
-    def log_session(self, session_type):
+    # Log each finished session into the session table for tracking
+    def log_session(self, engine):
         try:
-            # Log each cycle number and session type
-            with open("pomodoro_log.txt", "a") as file:
-                file.write(f"Cycle {self.current_cycle}: {session_type}\n")
+            # Log the finished session with its planned and actually run duration
+            planned = engine.durations[engine.session_type]
+            self.session_log.record(self.session_started or time.time(), time.time(), engine.cycle,
+                                    engine.session_type, planned, planned - engine.remaining)
         except Exception as e:
             print(f"Failed to log session: {e}")
 
-    # Displays the Pomodoro session history from the log file
+    # Displays the Pomodoro session history a page at a time, optionally within a date range
     def show_history(self):
-        try:
-            with open("pomodoro_log.txt", "r") as file:
-                history = file.read()
-    
-            history_window = tk.Toplevel(self.root)  # Create a new window to display history
-            history_window.title("Pomodoro History")
-    
-            history_label = tb.Label(
-                history_window,
-                text="Pomodoro Cycle History",
-                font=("Arial", 18),
-                bootstyle="info"
-            )
-            history_label.pack(pady=10)
-    
-            history_text = tk.Text(history_window, wrap="word", font=("Arial", 12))  # Create a text widget for the history
-            history_text.insert("end", history)  # Insert the history into the widget
-            history_text.config(state="disabled")  # Disable editing of the history
-            history_text.pack(pady=10)
-    
-        except FileNotFoundError:
+        # Buffered sessions are written first, since the log's lane runs jobs in order
+        self.session_log.flush_async()
+        self.mainApp.io.submit(self.session_log.exists, lane='pomodoro-log', on_done=self._open_history,
+                               on_error=lambda e: messagebox.showerror(title='History Error', message=f"Failed to read history: {e}"))
+
+    def _open_history(self, exists):
+        if not exists:
             # Handle the case when the history file doesn't exist
             history_window = tk.Toplevel(self.root)
             history_window.title("Pomodoro History")
@@ -1185,6 +3933,96 @@ class Pomodorotimer(Timer):
                 bootstyle="danger"
             )
             history_label.pack(pady=10)
+            return
+
+        history_window = tk.Toplevel(self.root)  # Create a new window to display history
+        history_window.title("Pomodoro History")
+
+        history_label = tb.Label(
+            history_window,
+            text="Pomodoro Cycle History",
+            font=("Arial", 18),
+            bootstyle="info"
+        )
+        history_label.pack(pady=10)
+
+        filter_frame = tb.Frame(history_window)
+        filter_frame.pack(pady=5)
+        tb.Label(filter_frame, text="From (YYYY-MM-DD)").pack(side='left', padx=5)
+        from_entry = tb.Entry(filter_frame, width=12)
+        from_entry.pack(side='left', padx=5)
+        tb.Label(filter_frame, text="To").pack(side='left', padx=5)
+        to_entry = tb.Entry(filter_frame, width=12)
+        to_entry.pack(side='left', padx=5)
+
+        columns = ("Start", "Session", "Planned", "Actual")
+        history_tree = ttk.Treeview(history_window, columns=columns, show='headings', height=15)
+        for column in columns:
+            history_tree.heading(column, text=column)
+            history_tree.column(column, width=160 if column == "Start" else 110, anchor='center')
+        history_tree.pack(padx=10, pady=10, fill='both', expand=True)
+
+        page_frame = tb.Frame(history_window)
+        page_frame.pack(pady=5)
+        previous_button = tb.Button(page_frame, text="Previous", bootstyle="primary-outline")
+        previous_button.pack(side='left', padx=10)
+        page_label = tb.Label(page_frame, text="Page 1")
+        page_label.pack(side='left', padx=10)
+        next_button = tb.Button(page_frame, text="Next", bootstyle="primary-outline")
+        next_button.pack(side='left', padx=10)
+
+        # Offsets of the pages visited so far, so Previous does not rescan the log
+        state = {'offsets': [None], 'next': None, 'range': (None, None)}
+
+        def show_page():
+            # Paging stays disabled until this page arrives
+            previous_button.config(state='disabled')
+            next_button.config(state='disabled')
+            self.mainApp.io.submit(self.session_log.page, *state['range'], state['offsets'][-1],
+                                   lane='pomodoro-log', on_done=render_page,
+                                   on_error=lambda e: messagebox.showerror(title='History Error', message=f"Failed to read history: {e}"))
+
+        def render_page(page):
+            if not history_window.winfo_exists():
+                return
+            entries, state['next'] = page
+            history_tree.delete(*history_tree.get_children())
+            for entry in entries:
+                history_tree.insert('', 'end', values=(
+                    entry['start'].replace('T', ' '), entry['type'],
+                    f"{entry['planned'] / 60:.1f} min", f"{entry['actual'] / 60:.1f} min"))
+            page_label.config(text=f"Page {len(state['offsets'])}")
+            previous_button.config(state='normal' if len(state['offsets']) > 1 else 'disabled')
+            next_button.config(state='normal' if state['next'] is not None else 'disabled')
+
+        def next_page():
+            state['offsets'].append(state['next'])
+            show_page()
+
+        def previous_page():
+            state['offsets'].pop()
+            show_page()
+
+        def apply_filter():
+            bounds = []
+            for text in (from_entry.get().strip(), to_entry.get().strip()):
+                if not text:
+                    bounds.append(None)
+                    continue
+                try:
+                    time.strptime(text, "%Y-%m-%d")
+                except ValueError:
+                    messagebox.showerror(title='Invalid Date', message='Please enter dates as YYYY-MM-DD.')
+                    return
+                bounds.append(text)
+            state['range'] = tuple(bounds)
+            state['offsets'] = [None]
+            show_page()
+
+        previous_button.config(command=previous_page)
+        next_button.config(command=next_page)
+        tb.Button(filter_frame, text="Filter", command=apply_filter, bootstyle="info-outline").pack(side='left', padx=5)
+        show_page()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,831 @@
+"""
+Tests for the headless parts of the application.
+
+Run with `python -m pytest test_src.py`; nothing here opens a window.
+"""
+import datetime
+import random
+import sqlite3
+import threading
+import time
+import types
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import (ChunkedCSVLoader, Database, DeckStore, ExpenseJournal, ExpenseRollup, ExpenseStore, ExpenseTracker,
+                 FlashcardApp, IOExecutor, PomodoroEngine, SessionLog, SqliteExpenseFormat, Task, TaskStore,
+                 TickScheduler, ToDoApp, VirtualClock, VirtualTreeview, format_cents)
+
+
+CATEGORIES = ["Food", "Transportation", "Utilities", "Entertainment", "Others"]
+WORDS = ["coffee", "taxi", "rent", "groceries", "lunch", "cinema", "bus", "books"]
+
+
+# Stands in for the ttk.Treeview behind a VirtualTreeview, holding just its selection
+class FakeTree:
+    def __init__(self):
+        self.selected = ()
+
+    def selection(self):
+        return self.selected
+
+
+# A VirtualTreeview with `window` materialised, driven without a display
+def make_virtual_view(window):
+    view = VirtualTreeview.__new__(VirtualTreeview)
+    view.tree = FakeTree()
+    view.selected = set()
+    view._replace = False
+    view._iids = {str(row_id): row_id for row_id in window}
+    return view
+
+
+def click(view, row_ids, state=0):
+    view._on_press(types.SimpleNamespace(state=state))
+    view.tree.selected = tuple(str(row_id) for row_id in row_ids)
+    view._on_select(None)
+
+
+@pytest.fixture
+def database(tmp_path):
+    return Database(str(tmp_path / "quaktask.db"))
+
+
+# A store holding four expenses over two months, returned with their row ids
+def make_small_store():
+    store = ExpenseStore(CATEGORIES)
+    coffee = store.append(datetime.date(2024, 1, 2), 3.5, "Food", "Morning coffee")
+    taxi = store.append(datetime.date(2024, 1, 1), 20, "Transportation", "Taxi home")
+    rent = store.append(datetime.date(2024, 2, 1), 900.1, "Utilities", "Rent")
+    lunch = store.append(datetime.date(2024, 1, 2), 12.25, "Food", "Lunch with coffee")
+    return store, (coffee, taxi, rent, lunch)
+
+
+# A store of `count` random expenses, added one by one so every index is kept incrementally
+def make_store(count, seed=0):
+    rng = random.Random(seed)
+    store = ExpenseStore(CATEGORIES)
+    for _ in range(count):
+        store.add_row(store.next_id, rng.randrange(18_000, 18_400), rng.randrange(1, 50_000),
+                      rng.choice(CATEGORIES), " ".join(rng.sample(WORDS, 2)))
+        store.next_id += 1
+    return store
+
+
+# The filters of `ExpenseStore.query` applied row by row, for comparison
+def brute_query(store, category=None, start_day=None, end_day=None, text=None):
+    rows = []
+    for row_id in store.rows():
+        day, cents, row_category, description = store.raw_row(row_id)
+        words = store.words(description)
+        if category is not None and row_category != category:
+            continue
+        if start_day is not None and day < start_day:
+            continue
+        if end_day is not None and day > end_day:
+            continue
+        if text and not all(any(word.startswith(prefix) for word in words) for prefix in store.words(text)):
+            continue
+        rows.append(row_id)
+    return rows
+
+
+def day_date(day):
+    return pd.Timestamp(day, unit='D')
+
+
+# Stands in for a Tk variable
+class FakeVar:
+    def __init__(self, value=''):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+# The filter widgets of an ExpenseTracker, enough to run `_current_filter`
+def make_filter_widgets(category='All', start='', end='', min_amount='', max_amount='', text=''):
+    return types.SimpleNamespace(filterVar=FakeVar(category), fromDateVar=FakeVar(start), toDateVar=FakeVar(end),
+                                 minAmountVar=FakeVar(min_amount), maxAmountVar=FakeVar(max_amount),
+                                 searchVar=FakeVar(text))
+
+
+# Stands in for the Tk root: `after` callbacks are queued and run in order by `run`
+class FakeRoot:
+    def __init__(self):
+        self.callbacks = []
+
+    def after(self, ms, callback, *args):
+        self.callbacks.append((callback, args))
+        return str(len(self.callbacks))
+
+    def run(self, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while self.callbacks and time.monotonic() < deadline:
+            callback, args = self.callbacks.pop(0)
+            # Give worker threads a moment before each poll
+            time.sleep(0.001)
+            callback(*args)
+        assert not self.callbacks, "callbacks still pending"
+
+
+# Streams a CSV through ChunkedCSVLoader as the tracker does, recording what the Tk thread receives
+def load_csv(path, chunksize=2, on_done=None):
+    root = FakeRoot()
+    store = ExpenseStore(CATEGORIES)
+    events = []
+
+    def done():
+        events.append(('done', None))
+        if on_done is not None:
+            on_done()
+
+    loader = ChunkedCSVLoader(
+        root, str(path),
+        on_chunk=lambda chunk: events.append(('chunk', store.extend(chunk, reindex=False))),
+        on_progress=lambda fraction: events.append(('progress', fraction)),
+        on_done=done,
+        on_error=lambda error: events.append(('error', error)),
+        prepare=lambda chunk: ExpenseTracker._prepare_chunk(ExpenseTracker, chunk),
+        chunksize=chunksize,
+        usecols=list(ExpenseTracker.CSV_DTYPES),
+        dtype=ExpenseTracker.CSV_DTYPES,
+    )
+    loader.start()
+    root.run()
+    return store, events
+
+
+# Stands in for IOExecutor, running each job right away on the calling thread
+class InlineExecutor:
+    def __init__(self):
+        self.lanes = []
+
+    def submit(self, fn, *args, lane=None, merge=None, on_done=None, on_error=None):
+        self.lanes.append(lane)
+        try:
+            result = fn(*args)
+        except Exception as e:
+            if on_error is not None:
+                on_error(e)
+            return
+        if on_done is not None:
+            on_done(result)
+
+
+def local_time(text):
+    return time.mktime(time.strptime(text, SessionLog.TIME_FORMAT))
+
+
+# An engine with short sessions on a virtual clock, recording the events it emits
+def make_engine(work=10, short_break=2, long_break=5):
+    clock = VirtualClock()
+    scheduler = TickScheduler(clock)
+    engine = PomodoroEngine("test", scheduler, work, short_break, long_break)
+    events = []
+    engine.listeners.append(lambda engine, event: events.append((event, engine.session_type)))
+    return engine, clock, scheduler, events
+
+
+def test_virtual_view_plain_click_replaces_offscreen_selection():
+    view = make_virtual_view([1, 2, 3])
+    click(view, [1])
+    # Row 1 scrolls out of view; its selection is kept while nothing else is clicked
+    view._iids = {str(row_id): row_id for row_id in [4, 5, 6]}
+    view.tree.selected = ()
+    view._on_select(None)
+    assert view.selection() == [1]
+
+    click(view, [5])
+    assert view.selection() == [5]
+
+
+def test_virtual_view_ctrl_and_shift_click_extend_selection():
+    view = make_virtual_view([1, 2, 3])
+    click(view, [1])
+    view._iids = {str(row_id): row_id for row_id in [4, 5, 6]}
+    click(view, [4], state=0x0004)
+    click(view, [4, 5, 6], state=0x0001)
+    assert sorted(view.selection()) == [1, 4, 5, 6]
+    # Ctrl-clicking a selected row in view deselects only that row
+    click(view, [4, 6], state=0x0004)
+    assert sorted(view.selection()) == [1, 4, 6]
+
+
+def test_store_append_keeps_date_order():
+    store, (coffee, taxi, rent, lunch) = make_small_store()
+    assert len(store) == 4 and store.next_id == 4
+    # Rows of the same day keep the order they were added in
+    assert store.rows() == [taxi, coffee, lunch, rent]
+    assert store.raw_row(rent) == (store.to_day(datetime.date(2024, 2, 1)), 90010, "Utilities", "Rent")
+    assert store.category_totals() == {"Food": 15.75, "Transportation": 20.0, "Utilities": 900.1}
+    assert store.total([coffee, lunch]) == 15.75
+
+
+def test_store_extend_files_blank_categories_and_rounds_like_append():
+    store = ExpenseStore(CATEGORIES)
+    row_ids = store.extend(pd.DataFrame({
+        'Date': pd.to_datetime(['2024-03-02', '2024-03-01', '2024-03-01']),
+        'Amount': [1.005, -2.675, 0.125],
+        'Category': ["Food", None, "Travel"],
+        'Description': ["Gum", None, "Ticket"],
+    }))
+    assert store.rows() == [row_ids[1], row_ids[2], row_ids[0]]
+    assert [store.raw_row(row_id)[1:] for row_id in row_ids] == [
+        (101, "Food", "Gum"), (-268, "Others", ""), (13, "Travel", "Ticket")]
+    assert [store.to_cents(amount) for amount in (1.005, -2.675, 0.125)] == [101, -268, 13]
+    assert "Travel" in store.categories
+
+
+def test_store_columns_round_trip():
+    store, row_ids = make_small_store()
+    copy = ExpenseStore.from_columns(**store.columns())
+    assert copy.rows() == store.rows() and copy.next_id == store.next_id
+    assert [copy.raw_row(row_id) for row_id in row_ids] == [store.raw_row(row_id) for row_id in row_ids]
+    assert copy.query(category="Food") == store.query(category="Food")
+
+
+def test_store_delete_by_row_id():
+    store, (coffee, taxi, rent, lunch) = make_small_store()
+    assert store.delete([coffee, coffee, 12345]) == [coffee]
+    assert coffee not in store and lunch in store and len(store) == 3
+    assert store.rows() == [taxi, lunch, rent]
+    assert store.query(category="Food") == [lunch]
+    assert store.sorted_rows("Amount", reverse=True) == [rent, taxi, lunch]
+    assert store.category_totals()["Food"] == 12.25
+    assert store.delete([coffee]) == []
+
+
+def test_compaction_remaps_slots_and_indexes():
+    store = make_store(400, seed=3)
+    store.COMPACT_MIN_TOMBSTONES = 16
+    # Build the lazy indexes first, so compaction has to remap them too
+    store.query(text="x")
+    store.sorted_rows("Category")
+    before = {row_id: store.raw_row(row_id) for row_id in store.rows()}
+
+    victims = store.rows()[::2]
+    store.delete(victims)
+    assert store._tombstones == 0 and store._size == len(store) == 200
+    for row_id in victims:
+        del before[row_id]
+    assert {row_id: store.raw_row(row_id) for row_id in store.rows()} == before
+
+    for text in ("coffee", "t", "rent bus"):
+        assert store.query(text=text) == brute_query(store, text=text)
+    assert store.query(category="Food") == brute_query(store, category="Food")
+    assert store.sorted_rows("Category") == sorted(before, key=lambda row_id: (before[row_id][2], before[row_id][0], row_id))
+    assert store.sorted_rows("Amount") == sorted(before, key=lambda row_id: (before[row_id][1], row_id))
+
+    # New rows after a compaction land in the remapped indexes
+    row_id = store.append(day_date(18_000), 1, "Food", "fresh coffee")
+    assert store.query(text="fresh") == [row_id] and store.rows()[0] == row_id
+
+
+def test_store_filters_match_brute_force():
+    store = make_store(500)
+    store.delete(store.rows()[::7])
+    for category in (None, "Food", "Missing"):
+        for days in ((None, None), (18_100, 18_200), (18_150, None)):
+            expected = brute_query(store, category, days[0], days[1])
+            start, end = (None if day is None else day_date(day) for day in days)
+            assert store.query(category=category, start=start, end=end) == expected
+            assert all(store.matches(row_id, category=category, start=start, end=end) for row_id in expected)
+
+    cheap = [row_id for row_id in store.rows() if 1_000 <= store.raw_row(row_id)[1] <= 5_000]
+    assert store.query(min_amount=10, max_amount=50) == cheap
+    assert store.query(category="Food", min_amount=10, max_amount=50) == [
+        row_id for row_id in cheap if store.raw_row(row_id)[2] == "Food"]
+
+
+def test_store_text_search_matches_brute_force():
+    store = make_store(500)
+    store.delete(store.rows()[::7])
+    for category in (None, "Food"):
+        for days in ((None, None), (18_100, 18_200)):
+            for text in ("co", "taxi bu", "zz"):
+                expected = brute_query(store, category, days[0], days[1], text)
+                start, end = (None if day is None else day_date(day) for day in days)
+                assert store.query(category=category, start=start, end=end, text=text) == expected
+                assert all(store.matches(row_id, category=category, start=start, end=end, text=text)
+                           for row_id in expected)
+
+    cheap = [row_id for row_id in brute_query(store, text="c") if store.raw_row(row_id)[1] <= 2_000]
+    assert store.query(max_amount=20, text="c") == cheap
+
+    # The cached prefix matches follow adds, deletes and compaction
+    added = store.append(datetime.date(2019, 6, 1), 1, "Food", "Coconut")
+    assert store.query(text="co") == brute_query(store, text="co") and added in store.query(text="co")
+    store.delete([added])
+    assert store.query(text="co") == brute_query(store, text="co")
+    store.compact()
+    assert store.query(text="co") == brute_query(store, text="co")
+
+
+def test_store_rejects_non_finite_amount_bounds():
+    store, _ = make_small_store()
+    for bound in (float('nan'), float('inf'), -float('inf')):
+        with pytest.raises(ValueError):
+            store.query(min_amount=bound)
+        with pytest.raises(ValueError):
+            store.append(datetime.date(2024, 1, 1), bound, "Food", "Broken")
+    assert len(store) == 4
+
+
+def test_filter_parsing_ignores_incomplete_and_rejects_non_finite_amounts():
+    widgets = make_filter_widgets(category='Food', start='2024-01', min_amount='1.5', max_amount='-')
+    filters = ExpenseTracker._current_filter(widgets, strict=True)
+    assert filters == {'category': 'Food', 'start': None, 'end': None, 'min_amount': 1.5, 'max_amount': None, 'text': None}
+
+    widgets = make_filter_widgets(max_amount='nan')
+    assert ExpenseTracker._current_filter(widgets)['max_amount'] is None
+    with pytest.raises(ValueError, match='maximum'):
+        ExpenseTracker._current_filter(widgets, strict=True)
+
+
+def test_csv_loader_streams_chunks_in_order(tmp_path):
+    path = tmp_path / "expenses.csv"
+    path.write_text("Date,Amount,Category,Description\n"
+                    "2024-01-03,1.5,Food,Tea\n2024-01-01,20,Others,Gift\n"
+                    "2024-01-02,3,,Bus\n2024-01-05,4.25,Food,\n2024-01-04,9,Utilities,Power\n")
+    store, events = load_csv(path)
+    assert [kind for kind, _ in events if kind != 'progress'] == ['chunk', 'chunk', 'chunk', 'done']
+    assert [row_ids for kind, row_ids in events if kind == 'chunk'] == [[0, 1], [2, 3], [4]]
+    fractions = [fraction for kind, fraction in events if kind == 'progress']
+    assert fractions == sorted(fractions) and fractions[-1] == 1.0
+
+    store.reindex()
+    assert [store.raw_row(row_id)[3] for row_id in store.rows()] == ["Gift", "Bus", "Tea", "Power", ""]
+    assert store.raw_row(2)[2] == "Others" and store.raw_row(3)[1] == 425
+
+
+def test_csv_loader_rejects_rows_without_date_or_amount(tmp_path):
+    path = tmp_path / "expenses.csv"
+    path.write_text("Date,Amount,Category,Description\n"
+                    "2024-01-03,1.5,Food,Tea\n2024-01-01,20,Others,Gift\n"
+                    "2024-01-02,3,Food,Bus\n2024-01-05,,Food,Lunch\n,2,Food,Snack\n")
+    store, events = load_csv(path)
+    kinds = [kind for kind, _ in events if kind != 'progress']
+    assert kinds == ['chunk', 'error']
+    assert "line 5" in str(events[-1][1])
+
+
+def test_csv_loader_reports_errors_from_on_done(tmp_path):
+    path = tmp_path / "expenses.csv"
+    path.write_text("Date,Amount,Category,Description\n2024-01-03,1.5,Food,Tea\n")
+
+    def fail():
+        raise RuntimeError("cannot finish")
+
+    store, events = load_csv(path, on_done=fail)
+    assert events[-2][0] == 'done' and events[-1][0] == 'error'
+    assert str(events[-1][1]) == "cannot finish"
+
+
+def test_journal_writes_only_changed_rows(database):
+    storage = SqliteExpenseFormat(database)
+    journal = storage.journal()
+    store, row_ids = make_small_store()
+    storage.save(store.columns())
+
+    row_id = store.append(datetime.date(2024, 3, 1), 7.5, "Transportation", "Bus")
+    journal.record_add(row_id, *store.raw_row(row_id))
+    store.delete([row_ids[0]])
+    journal.record_delete([row_ids[0]])
+    late = store.append(datetime.date(2024, 3, 2), 1, "Food", "Recorded after the save")
+    journal.record_add(late, *store.raw_row(late))
+
+    # A save only writes what was recorded before it was requested
+    assert journal.flush(journal.seq - 1) == 2
+    assert [operation['id'] for operation in journal.pending] == [late]
+    assert journal.flush() == 1 and journal.flush() == 0
+
+    saved = ExpenseStore.from_columns(**storage.load())
+    assert saved.rows() == store.rows() and saved.next_id == store.next_id
+    assert [saved.raw_row(row_id) for row_id in saved.rows()] == [store.raw_row(row_id) for row_id in store.rows()]
+
+
+def test_journal_keeps_operations_whose_write_failed(database):
+    journal = ExpenseJournal(database)
+    journal.record_add(1, 19_000, 100, "Food", "Tea")
+    # NOT NULL fails the whole transaction, so the first add is not written either
+    journal.record_add(2, 19_000, 100, None, "Broken")
+    with pytest.raises(Exception):
+        journal.flush()
+    assert [operation['id'] for operation in journal.pending] == [1, 2]
+    assert database.query("SELECT COUNT(*) FROM expenses") == [(0,)]
+
+
+def test_rollup_matches_day_buckets():
+    rng = random.Random(1)
+    rollup = ExpenseRollup()
+    totals = {}
+    # Days jump below and above the covered range, so it has to grow and move both ways
+    for _ in range(2000):
+        code, day, cents = rng.randrange(3), rng.randrange(19_000, 21_000), rng.randrange(-5_000, 5_000)
+        rollup.add(code, day, cents)
+        totals[code, day] = totals.get((code, day), 0) + cents
+
+    for _ in range(200):
+        start = rng.randrange(18_900, 21_100)
+        end = rng.randrange(start, 21_200)
+        for code in (None, 0, 2):
+            expected = sum(cents for (bucket_code, day), cents in totals.items()
+                           if (code is None or bucket_code == code) and start <= day <= end)
+            assert rollup.range_sum(code, start, end) == expected
+
+    # Rebuilding from whole columns gives the same sums as the incremental updates
+    keys = list(totals)
+    rebuilt = ExpenseRollup()
+    rebuilt.rebuild(np.array([code for code, _ in keys]), np.array([day for _, day in keys]),
+                    np.array([totals[key] for key in keys]))
+    assert rebuilt.range_sum(None, 19_000, 21_000) == rollup.range_sum(None, 19_000, 21_000)
+    assert rebuilt.range_sum(1, 19_500, 20_500) == rollup.range_sum(1, 19_500, 20_500)
+
+
+def test_store_spend_follows_adds_and_deletes():
+    store = make_store(300, seed=2)
+    store.delete(store.rows()[::3])
+    for category in (None, "Food", "Others"):
+        expected = sum(store.raw_row(row_id)[1] for row_id in store.query(category=category, start=day_date(18_050),
+                                                                         end=day_date(18_250)))
+        assert round(store.spend(category, day_date(18_050), day_date(18_250)) * 100) == expected
+
+
+def test_store_spend_series_by_resolution():
+    store = ExpenseStore(CATEGORIES)
+    # 2024-01-01 was a Monday
+    for date, amount in (("2024-01-01", 1), ("2024-01-07", 2), ("2024-01-08", 4), ("2024-02-01", 8)):
+        store.append(pd.Timestamp(date), amount, "Food", "")
+    store.append(pd.Timestamp("2024-01-03"), 100, "Others", "")
+
+    weekly = store.spend_series("Food", 'Weekly')
+    assert weekly[pd.Timestamp("2024-01-01")] == 3 and weekly[pd.Timestamp("2024-01-08")] == 4
+    monthly = store.spend_series(None, 'Monthly')
+    assert monthly.tolist() == [107, 8] and list(monthly.index) == [pd.Timestamp("2024-01-01"), pd.Timestamp("2024-02-01")]
+    assert store.spend_series("Food", 'Daily').sum() == 15
+
+
+def test_session_log_writes_full_batches(database):
+    executor = InlineExecutor()
+    log = SessionLog(database, executor, batch_size=2)
+    start = local_time("2024-05-01T09:00:00")
+    log.record(start, start + 1500, 1, "Work Duration", 1500, 1490.04)
+    assert executor.lanes == [] and len(log.pending) == 1
+    log.record(start + 1500, start + 1800, 2, "Short Break", 300, 300)
+    assert executor.lanes == ['pomodoro-log'] and log.pending == []
+
+    entries, offset = log.page()
+    assert offset is None and log.exists()
+    assert entries[0] == {'start': "2024-05-01T09:00:00", 'end': "2024-05-01T09:25:00", 'cycle': 1,
+                          'type': "Work Duration", 'planned': 1500, 'actual': 1490.0}
+
+
+def test_session_log_keeps_entries_whose_write_failed(database, monkeypatch):
+    log = SessionLog(database, InlineExecutor())
+    start = local_time("2024-05-01T09:00:00")
+    log.record(start, start + 60, 1, "Work Duration", 60, 60)
+
+    def locked():
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(database, 'transaction', locked)
+    with pytest.raises(sqlite3.OperationalError):
+        log.flush()
+    log.record(start + 60, start + 120, 2, "Short Break", 60, 60)
+    assert [entry[2] for entry in log.pending] == [1, 2]
+
+    monkeypatch.undo()
+    assert log.flush() == 2 and log.pending == []
+    assert [entry['cycle'] for entry in log.page()[0]] == [1, 2]
+
+
+def test_session_log_pages_through_a_date_range(database):
+    log = SessionLog(database, InlineExecutor(), batch_size=100)
+    # Two sessions share each start time, so pages must continue by id within a start
+    for day in range(1, 6):
+        for cycle in (1, 2):
+            start = local_time(f"2024-05-0{day}T09:00:00")
+            log.record(start, start + 60, cycle, "Work Duration", 60, 60)
+    log.flush()
+
+    seen = []
+    offset = None
+    while True:
+        entries, offset = log.page("2024-05-02", "2024-05-04", offset, limit=4)
+        seen.extend((entry['start'][:10], entry['cycle']) for entry in entries)
+        if offset is None:
+            break
+    assert seen == [(f"2024-05-0{day}", cycle) for day in (2, 3, 4) for cycle in (1, 2)]
+    assert len(log.page(limit=100)[0]) == 10 and log.page("2024-06-01")[0] == []
+
+
+def test_database_settings_and_rollback(database):
+    assert database.get_setting('missing', {'a': 1}) == {'a': 1}
+    with database.transaction() as connection:
+        database.set_setting(connection, 'tasks', {'next_id': 3})
+    with pytest.raises(sqlite3.IntegrityError):
+        with database.transaction() as connection:
+            connection.execute("INSERT INTO tasks (id, task, important, done) VALUES (1, 'Write', 0, 0)")
+            connection.execute("INSERT INTO tasks (id, task, important, done) VALUES (1, 'Again', 0, 0)")
+    assert database.query("SELECT COUNT(*) FROM tasks")[0][0] == 0
+    assert database.get_setting('tasks') == {'next_id': 3}
+
+
+def test_database_marks_tables_saved_before_the_marker(tmp_path):
+    path = str(tmp_path / "old.db")
+    Database(path)
+    with sqlite3.connect(path) as connection:
+        connection.execute("DELETE FROM settings")
+        connection.execute("INSERT INTO tasks (id, task, important, done) VALUES (1, 'Write', 0, 0)")
+    database = Database(path)
+    assert database.get_setting('tasks') == {}
+    assert database.get_setting('expenses') is None
+
+
+def test_expense_save_marker_survives_deleting_every_row(database):
+    storage = SqliteExpenseFormat(database)
+    assert not storage.exists()
+    journal = storage.journal()
+    journal.record_add(4, 19_000, 250, "Food", "Tea")
+    journal.flush()
+    journal.record_delete([4])
+    journal.flush()
+    assert storage.exists()
+    columns = storage.load()
+    assert len(columns['ids']) == 0
+    assert columns['categories'] == ["Food"] and columns['next_id'] == 5
+
+
+def test_tasks_csv_is_imported_only_once(database, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pd.DataFrame({'ID': [1, 2], 'Task': ["Write", "Read"], 'Important': ["✅", "❌"],
+                  'Done': ["❌", "✅"]}).to_csv("tasks.csv", index=False)
+    app = ToDoApp.__new__(ToDoApp)
+    app.database = database
+    store = app._read_saved_tasks()
+    assert database.query("SELECT task FROM tasks ORDER BY id") == [("Write",), ("Read",)]
+    app._write_tasks([], [row[0] for row in store.rows()], store.next_id)
+    again = app._read_saved_tasks()
+    assert again.rows() == [] and again.next_id == store.next_id
+
+
+def test_failed_snapshot_is_retried_on_next_save(database, monkeypatch):
+    monkeypatch.setattr("src.messagebox.askokcancel", lambda **kwargs: True)
+    errors = []
+    monkeypatch.setattr("src.messagebox.showerror", lambda **kwargs: errors.append(kwargs['message']))
+    monkeypatch.setattr("src.messagebox.showinfo", lambda **kwargs: None)
+    tracker = ExpenseTracker.__new__(ExpenseTracker)
+    tracker.io = InlineExecutor()
+    tracker.loaded = True
+    tracker.store, _ = make_small_store()
+    tracker.storage = SqliteExpenseFormat(database)
+    tracker.journal = tracker.storage.journal()
+    tracker.snapshot_required = True
+
+    def fail(columns):
+        raise sqlite3.OperationalError("database is locked")
+    tracker._write_snapshot = fail
+    tracker.save_Expenses()
+    assert errors and tracker.snapshot_required
+
+    del tracker._write_snapshot
+    tracker.save_Expenses()
+    assert len(errors) == 1 and not tracker.snapshot_required
+    assert len(tracker.storage.load()["ids"]) == len(tracker.store)
+
+
+def test_io_lane_runs_in_order_and_merges_waiting_saves():
+    root = FakeRoot()
+    io = IOExecutor(root)
+    started, release = threading.Event(), threading.Event()
+    ran, done = [], []
+
+    def first():
+        started.set()
+        release.wait(5)
+        ran.append("first")
+    io.submit(first, lane='expenses', on_done=lambda _: done.append("first"))
+    started.wait(5)
+    io.submit(ran.append, "stale", lane='expenses', merge='save', on_done=lambda _: done.append("stale"))
+    io.submit(ran.append, "latest", lane='expenses', merge='save', on_done=lambda _: done.append("latest"))
+    assert io.pending() == 2
+    release.set()
+    assert io.flush(5)
+    root.run()
+    assert ran == ["first", "latest"] and done == ["first", "latest"]
+
+
+def test_io_routes_errors(capsys):
+    root = FakeRoot()
+    io = IOExecutor(root)
+    errors = []
+
+    def fail():
+        raise OSError("disk full")
+    io.submit(fail, on_error=errors.append)
+    io.submit(fail)
+    io.submit(lambda: 1, on_done=lambda _: 1 / 0)
+    io.flush(5)
+    root.run()
+    assert [str(error) for error in errors] == ["disk full"]
+    output = capsys.readouterr().out
+    assert "Background I/O failed: disk full" in output and "I/O callback failed" in output
+
+
+def test_expense_exit_hook_saves_pending_changes(database, monkeypatch):
+    answers = []
+    monkeypatch.setattr("src.messagebox.askyesno", lambda **kwargs: answers.append(kwargs) or True)
+    tracker = ExpenseTracker.__new__(ExpenseTracker)
+    tracker.io = InlineExecutor()
+    tracker.loaded = True
+    tracker.store, _ = make_small_store()
+    tracker.storage = SqliteExpenseFormat(database)
+    tracker.journal = tracker.storage.journal()
+    tracker.snapshot_required = False
+    tracker.save_on_exit()
+    assert not answers
+
+    row_id = tracker.store.append(datetime.date(2024, 3, 1), 4, "Food", "Bagel")
+    tracker.journal.record_add(row_id, *tracker.store.raw_row(row_id))
+    tracker.save_on_exit()
+    assert len(answers) == 1 and not tracker.journal.pending
+    assert tracker.storage.load()['ids'].tolist() == [row_id]
+
+
+def test_format_cents_and_total_label():
+    assert format_cents([0, 5, -5, 1250, -500, 123456789]) == ["$0.00", "$0.05", "-$0.05", "$12.50", "-$5.00",
+                                                               "$1234567.89"]
+    tracker = ExpenseTracker.__new__(ExpenseTracker)
+    tracker.store = ExpenseStore(CATEGORIES)
+    tracker.store.append(datetime.date(2024, 1, 2), 2.5, "Food", "Refund")
+    tracker.store.append(datetime.date(2024, 1, 3), -7.5, "Food", "Refund")
+    label = {}
+    tracker.totalLabel = types.SimpleNamespace(config=lambda **kwargs: label.update(kwargs))
+    tracker._update_total({'min_amount': None, 'max_amount': None, 'text': None, 'category': None,
+                           'start': None, 'end': None})
+    assert label['text'] == "Total: -$5.00"
+
+
+def test_task_store_bulk_updates_return_changed_ids():
+    store = TaskStore([(3, "Call bank", 0, 0, None), (1, "Write report", 1, 0, None)])
+    assert store.ids() == [1, 3] and len(store) == 2 and 3 in store and 2 not in store
+    assert store.set_flag([1, 3, 99], 'important', True) == [3]
+    assert store.set_flag([3], 'done', True) == [3] and store.set_flag([3], 'done', True) == []
+    store.edit(1, "Write summary")
+    assert store.task(1) == "Write summary"
+    assert store.delete([1, 2]) == [1]
+    assert store.rows() == [(3, "Call bank", True, True, TaskStore.today())]
+    assert store.display_rows() == [("3", "Call bank", "✅", "✅")]
+
+
+def test_task_ids_are_never_reused():
+    store = TaskStore([(1, "Write report", 1, 0, None), (4, "Call bank", 0, 1, 739_000)], next_id=6)
+    assert store.next_id == 6
+    assert store.add("Buy coffee") == 6
+    store.delete([6, 4])
+    assert store.add("Buy tea") == 7
+    # A saved sequence behind the highest ID still moves past it
+    assert TaskStore([(9, "Old", 0, 0, None)], next_id=2).next_id == 10
+
+    record = store.tasks[1]
+    assert not hasattr(record, '__dict__') and record.flags == Task.IMPORTANT
+    assert record.important and not record.done
+
+
+def test_task_store_bitmaps_follow_flags():
+    store = TaskStore([(1, "Write report", 1, 0, None), (4, "Call bank", 0, 1, TaskStore.today() - 3)], next_id=6)
+    assert store.next_id == 6 and store.ids() == [1, 4]
+    added = store.add("Buy coffee")
+    assert added == 6
+
+    assert store.set_flag([6, 99], 'important', True) == [6]
+    assert store.set_flag([1, 6], 'done', True) == [1, 6]
+    assert store.set_flag([1], 'done', True) == []
+    assert store.query('Important') == [1, 6]
+    assert store.query('Done') == [1, 4, 6]
+    assert store.query('Done today') == [1, 6]
+    assert store.query('Not done') == []
+
+    assert store.set_flag([6], 'done', False) == [6]
+    assert store.query('Important and not done') == [6]
+    assert store._status[6] == TaskStore.LIVE | TaskStore.FLAGS['important'] and store._done_on[6] == 0
+
+    assert store.delete([1, 2]) == [1]
+    assert store._status[1] == 0 and 1 not in store
+    assert store.query('Important') == [6]
+    # Every view agrees with checking the records one at a time
+    for view in TaskStore.VIEWS:
+        assert store.query(view) == [task_id for task_id in store.ids() if store.matches(task_id, view)]
+
+
+def test_task_store_text_search_and_growth():
+    store = TaskStore()
+    task_ids = [store.add(f"task {index} {'urgent' if index % 10 == 0 else 'later'}") for index in range(200)]
+    assert task_ids == list(range(1, 201)) and len(store._status) >= 201
+    assert store.query(text="URGENT") == task_ids[::10]
+    store.edit(task_ids[0], "relaxed")
+    store.delete([task_ids[10]])
+    assert store.query(text="urgent") == task_ids[20::10]
+    assert store.query(text="ax") == [task_ids[0]]
+
+
+def test_deck_store_moves_legacy_cards_and_counts_adds(database, tmp_path):
+    legacy = tmp_path / "flashcards.json"
+    legacy.write_text('{"2 + 2": "4", "Capital of France": "Paris"}')
+    store = DeckStore(database, str(legacy))
+    (default_id, name, cards), = store.decks()
+    assert name == DeckStore.DEFAULT_DECK and cards == 2
+    assert store.load(default_id) == {"2 + 2": "4", "Capital of France": "Paris"}
+
+    spanish_id, _, _ = store.create_deck("Spanish", [("hola", "hello")])
+    assert store.add(spanish_id, [("gato", "cat"), ("hola", "hi")]) == 1
+    assert store.load(spanish_id) == {"hola": "hello", "gato": "cat"}
+    store.clear(default_id)
+    assert store.decks() == [(default_id, name, 0), (spanish_id, "Spanish", 2)]
+
+
+def test_flashcard_added_while_loading_counts_only_new_cards(database, tmp_path, monkeypatch):
+    messages = []
+    monkeypatch.setattr("src.messagebox.showinfo", lambda *args: messages.append(args[0]))
+    monkeypatch.setattr("src.messagebox.showerror", lambda *args: messages.append(args[0]))
+    app = FlashcardApp.__new__(FlashcardApp)
+    app.io = InlineExecutor()
+    app.deck_store = DeckStore(database, str(tmp_path / "missing.json"))
+    deck_id, _, _ = app.deck_store.create_deck("Spanish", [("hola", "hello")])
+    app.decks = {"Spanish": (deck_id, 1)}
+    app.deck_id, app.deck_name = deck_id, "Spanish"
+    # The deck's cards have not arrived yet
+    app.flashcards = {}
+    app.deck_combo = types.SimpleNamespace(winfo_exists=lambda: False)
+    for question, answer in (("hola", "hi"), ("gato", "cat")):
+        app.question_entry = types.SimpleNamespace(get=lambda: question, delete=lambda *args: None)
+        app.answer_entry = types.SimpleNamespace(get=lambda: answer, delete=lambda *args: None)
+        app.process_add_flashcard()
+    assert messages == ["Error", "Success"] and app.decks["Spanish"] == (deck_id, 2)
+
+    app._use_flashcards(deck_id, app.deck_store.load(deck_id))
+    assert app.flashcards == {"hola": "hello", "gato": "cat"}
+
+
+def test_pomodoro_start_pause_resume():
+    engine, clock, scheduler, events = make_engine()
+    engine.start()
+    assert (engine.session_type, engine.running, engine.deadline) == ("Work Duration", True, 10)
+
+    clock.advance(4)
+    engine.pause()
+    assert not engine.running and engine.remaining == 6
+    # A paused session has no deadline, however long it stays paused
+    clock.advance(100)
+    assert scheduler.run_due() == 0 and engine.time_left() == 6
+
+    engine.resume()
+    assert engine.deadline == 110
+    clock.advance(6)
+    assert scheduler.run_due() == 1
+    assert engine.session_type == "Short Break" and engine.running
+    assert [event for event, _ in events] == ['session', 'resumed', 'paused', 'resumed', 'session_end', 'session', 'resumed']
+
+
+def test_pomodoro_skip_starts_next_session_paused():
+    engine, clock, scheduler, events = make_engine()
+    engine.start()
+    clock.advance(3)
+    engine.skip()
+    assert engine.session_type == "Short Break" and not engine.running and engine.remaining == 2
+    assert len(scheduler) == 0
+    # 'session_end' still reports the skipped session and its unused time
+    assert ('session_end', "Work Duration") in events and engine.cycle == 2
+
+
+def test_pomodoro_cycle_complete_without_drift():
+    engine, clock, scheduler, events = make_engine()
+    engine.start()
+    # Waking up long after every deadline still runs each session from the previous deadline
+    clock.advance(10 + 2 + 10 + 5 + 30)
+    assert scheduler.run_due() == 4
+    assert engine.pomodoro_count == 1 and engine.session_type is None and not engine.running
+    assert events[-1] == ('cycle_complete', None)
+    assert [session for event, session in events if event == 'session'] == list(PomodoroEngine.SESSIONS)
+
+    engine.reset()
+    assert engine.pomodoro_count == 0 and len(scheduler) == 0
+
+
+def test_pomodoro_engines_share_one_scheduler():
+    clock = VirtualClock()
+    scheduler = TickScheduler(clock)
+    engines = [PomodoroEngine(f"timer-{index}", scheduler, 10 + index, 2, 5) for index in range(3)]
+    for engine in engines:
+        engine.start()
+    assert len(scheduler) == 3 and scheduler.next_deadline() == 10
+
+    # Pausing one timer leaves the others' deadlines alone
+    engines[1].pause()
+    clock.advance(11)
+    assert scheduler.run_due() == 1
+    assert [engine.session_type for engine in engines] == ["Short Break", "Work Duration", "Work Duration"]
+    assert engines[1].remaining == 11 and scheduler.next_deadline() == 12 and len(scheduler) == 2